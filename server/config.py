@@ -27,6 +27,60 @@ CONFIDENCE_THRESHOLD = 0.3
 # Camera settings
 CAMERA_INDEX = 0  # Usually 0 for built-in webcam, 1 for external
 
+# Frames are downscaled to this (width, height) before emotion analysis
+# Smaller = faster, but faces far from the camera may be missed
+ANALYSIS_FRAME_SIZE = (320, 240)
+
+# Smallest face (in analysis-frame pixels) the detector looks for.
+# Higher = faster detection, but only closer faces are picked up
+MIN_FACE_SIZE = 32
+
+# Face detector: 'haar' (OpenCV's bundled cascade) or 'yunet', OpenCV's
+# small CNN detector (more robust to pose and lighting, similar speed on a
+# CPU). YuNet needs OpenCV >= 4.8 and the model file at YUNET_MODEL_PATH
+# (face_detection_yunet_2023mar.onnx from the OpenCV Zoo); Haar is used
+# when it can't be loaded
+FACE_DETECTOR = 'haar'
+YUNET_MODEL_PATH = 'face_detection_yunet_2023mar.onnx'
+
+# Skip the emotion model when the scene hasn't changed since the last
+# analyzed frame (mean absolute gray-level difference on an 80x60 thumbnail)
+# and reuse the previous result. 0 = always analyze
+MOTION_THRESHOLD = 0.5
+
+# Frames sent through the emotion model per call. 1 = lowest latency;
+# larger batches raise throughput on a GPU but delay each result by
+# (batch size - 1) detection intervals
+ANALYSIS_BATCH_SIZE = 1
+
+# Emotion model:
+# - 'deepface': DeepFace's 48x48 emotion CNN (downloaded automatically)
+# - 'mini_xception': a much smaller 64x64 FER2013 model (e.g. mini-Xception
+#   from oarriaga/face_classification converted to ONNX), read from
+#   MINI_XCEPTION_PATH; needs onnxruntime. Falls back to 'deepface' if missing
+EMOTION_BACKEND = 'deepface'
+MINI_XCEPTION_PATH = 'mini_xception.onnx'
+
+# Run the emotion model with ONNX Runtime instead of TensorFlow when
+# onnxruntime is installed. The model is exported once (needs tf2onnx)
+# to ONNX_MODEL_PATH and loaded from there on later runs.
+USE_ONNX_RUNTIME = True
+ONNX_MODEL_PATH = 'emotion.onnx'
+
+# Run an INT8-quantized copy of the ONNX model on the CPU (saved next to
+# ONNX_MODEL_PATH as *_int8.onnx). Faster on CPUs without a usable GPU,
+# at the cost of slightly less precise scores
+ONNX_INT8 = False
+
+# Run the emotion model in float16 (ONNX: a *_fp16.onnx copy, needs
+# onnxconverter-common; TensorFlow: mixed_float16 policy). Only worth it on
+# a GPU; on most CPUs float16 is slower. ONNX_INT8 takes precedence
+USE_FP16 = False
+
+# How the TensorFlow emotion model is run when ONNX Runtime isn't used:
+# 'xla' = compile the forward pass once with XLA, 'none' = plain Keras predict
+JIT_BACKEND = 'xla'
+
 # Hardware communication settings
 # Your teammate can modify these for their setup
 SERIAL_PORT = '/dev/tty.usbmodem1101'  # macOS port for Arduino
@@ -37,12 +91,23 @@ OUTPUT_TO_CONSOLE = True      # Print to terminal
 OUTPUT_TO_FILE = True         # Write to output.txt
 OUTPUT_TO_SERIAL = True      # Send to Arduino (enable when hardware ready)
 
+# Linux only: pin the camera capture thread to one CPU core and the
+# emotion analysis thread to the others, to reduce scheduling jitter
+PIN_THREADS = False
+
+# Print every per-frame analysis result ([ANALYSIS ...] lines) to the terminal
+DEBUG_ANALYSIS = False
+
 # Control when signals are emitted
 # - ENABLE_AUTO_SIGNALING: emit haptics as soon as sustained emotion detected
 # - ENABLE_SIGNAL_ON_API: emit haptics when /gemini is called
 ENABLE_AUTO_SIGNALING = False
 ENABLE_SIGNAL_ON_API = True
 
+# /gemini falls back to the locally detected dominant emotion if Gemini
+# hasn't answered within this many seconds
+GEMINI_TIMEOUT_SECONDS = 10.0
+
 # Sustained detection and cooldown settings
 # Emotion must be sustained within a sliding window to trigger output
 SUSTAIN_WINDOW_SECONDS = 1.5        # Analyze consistency over this window
@@ -0,0 +1,136 @@
+"""
+Emotion History
+===============
+Sliding window of recent emotion analysis results, shared between the
+detection loop (writer) and the Flask /gemini endpoint (reader).
+
+Samples live in a fixed-size ring buffer of parallel NumPy arrays
+(timestamp, emotion id, confidence) so appending never allocates, and the
+per-emotion count of strong-confidence samples is kept up to date as
+samples enter and leave the window instead of being recounted every tick.
+"""
+
+import threading
+
+import numpy as np
+
+import config
+
+# Emotion labels get small integer ids (in config order); the detection
+# loop passes ids around so the hot path never hashes label strings
+EMOTION_LABELS = list(config.EMOTION_TO_VIBRATION)
+EMOTION_IDS = {name: i for i, name in enumerate(EMOTION_LABELS)}
+NO_EMOTION = -1  # id used when no face / unknown label was detected
+
+# Vibration count per emotion id (same values as config.EMOTION_TO_VIBRATION)
+VIBRATION_TABLE = [config.EMOTION_TO_VIBRATION[name] for name in EMOTION_LABELS]
+
+
+class EmotionHistory:
+    """Time-bounded ring buffer of (timestamp, emotion, confidence) samples."""
+
+    def __init__(self, window_seconds: float, capacity: int):
+        self.window_seconds = window_seconds
+        self.capacity = capacity
+        self.lock = threading.Lock()
+
+        # Structure-of-arrays storage; slot order is head, head+1, ... (mod capacity)
+        self._ts = np.zeros(capacity, dtype=np.float64)
+        self._emo = np.full(capacity, NO_EMOTION, dtype=np.int8)
+        self._conf = np.zeros(capacity, dtype=np.float32)
+        self._is_strong = np.zeros(capacity, dtype=bool)
+        self._head = 0   # slot of the oldest sample
+        self._size = 0
+
+        # Strong-confidence sample count per emotion id, maintained incrementally.
+        # A plain list: single-element updates are cheaper than on a NumPy array.
+        self._strong_counts = [0] * len(EMOTION_LABELS)
+        self._strong_threshold = config.STRONG_CONFIDENCE_THRESHOLD
+
+    def __len__(self):
+        return self._size
+
+    def append(self, timestamp: float, emotion_id: int, confidence: float):
+        """Record one analysis result (emotion id or NO_EMOTION) and drop expired samples."""
+        with self.lock:
+            # Threshold is adjustable from the UI; recount when it moves
+            if config.STRONG_CONFIDENCE_THRESHOLD != self._strong_threshold:
+                self._recount_strong(config.STRONG_CONFIDENCE_THRESHOLD)
+
+            self._evict_older_than(timestamp - self.window_seconds)
+            if self._size == self.capacity:
+                self._pop_oldest()
+
+            slot = (self._head + self._size) % self.capacity
+            strong = emotion_id != NO_EMOTION and confidence >= self._strong_threshold
+            self._ts[slot] = timestamp
+            self._emo[slot] = emotion_id
+            self._conf[slot] = confidence
+            self._is_strong[slot] = strong
+            if strong:
+                self._strong_counts[emotion_id] += 1
+            self._size += 1
+
+    def dominant_strong(self):
+        """
+        Return (emotion_id, strong_count, total_samples) for the emotion with
+        the most strong-confidence samples in the window, or
+        (NO_EMOTION, 0, total) when there are none.
+        """
+        with self.lock:
+            total = self._size
+            if total == 0:
+                return NO_EMOTION, 0, 0
+            counts = self._strong_counts
+            best = max(range(len(counts)), key=counts.__getitem__)
+            count = counts[best]
+        if count == 0:
+            return NO_EMOTION, 0, total
+        return best, count, total
+
+    def samples_since(self, cutoff: float):
+        """
+        Return (emotion_ids, confidences) NumPy arrays for samples with a
+        detected emotion at or after cutoff, oldest first.
+        """
+        with self.lock:
+            # Timestamps are appended in order, so only the tail after cutoff is copied
+            start = self._first_at_or_after(cutoff)
+            slots = (self._head + np.arange(start, self._size)) % self.capacity
+            emo = self._emo[slots]
+            conf = self._conf[slots]
+        keep = emo != NO_EMOTION
+        return emo[keep], conf[keep]
+
+    def _first_at_or_after(self, cutoff: float):
+        """Binary search (in ring order) for the first sample with timestamp >= cutoff."""
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._ts[(self._head + mid) % self.capacity] < cutoff:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _evict_older_than(self, cutoff: float):
+        while self._size and self._ts[self._head] < cutoff:
+            self._pop_oldest()
+
+    def _pop_oldest(self):
+        slot = self._head
+        if self._is_strong[slot]:
+            self._strong_counts[self._emo[slot]] -= 1
+            self._is_strong[slot] = False
+        self._head = (slot + 1) % self.capacity
+        self._size -= 1
+
+    def _recount_strong(self, threshold: float):
+        # One vectorized pass over the live slots instead of a per-sample Python loop
+        self._strong_threshold = threshold
+        slots = (self._head + np.arange(self._size)) % self.capacity
+        emo = self._emo[slots]
+        strong = (emo != NO_EMOTION) & (self._conf[slots] >= threshold)
+        self._is_strong[:] = False
+        self._is_strong[slots] = strong
+        self._strong_counts = np.bincount(emo[strong], minlength=len(EMOTION_LABELS)).tolist()
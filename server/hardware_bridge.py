@@ -11,6 +11,9 @@ FOR THE HARDWARE TEAMMATE:
 
 import config
 import json
+import os
+import queue
+import threading
 from datetime import datetime
 
 # Try to import serial (for Arduino communication)
@@ -24,6 +27,21 @@ except ImportError:
 # Global serial connection
 serial_connection = None
 
+# Serial writes happen on a background thread so the detection loop never
+# blocks on the USB link; a small queue keeps only the freshest payloads
+_tx_queue = queue.Queue(maxsize=8)
+_tx_thread = None
+_TX_STOP = object()
+
+# output.txt is replaced atomically from a temp file; the lock keeps the
+# detection thread and request threads from sharing the temp file
+_OUTPUT_PATH = "output.txt"
+_OUTPUT_TMP_PATH = "output.txt.tmp"
+_output_lock = threading.Lock()
+
+# output.txt layout, identical to json.dumps(data) for the fixed schema we write
+_OUTPUT_TEMPLATE = '{{"timestamp": "{}", {}, "confidence": {}}}'
+
 # Simple buzzer pulse patterns (milliseconds HIGH per pulse)
 # Tweak as needed to feel distinct on the active buzzer
 BUZZER_PATTERNS = {
@@ -37,6 +55,27 @@ BUZZER_PATTERNS = {
 }
 
 
+def _encode_pattern(pattern) -> bytes:
+    """Serial message for a pattern: "B:120,120,200\n" (ms HIGH durations per pulse)."""
+    return f"B:{','.join(str(p) for p in pattern if p > 0)}\n".encode()
+
+
+def _output_fields(emotion: str, pattern) -> str:
+    """The emotion/buzzer_pattern part of an output.txt line, JSON-encoded."""
+    return f'"emotion": {json.dumps(emotion)}, "buzzer_pattern": {json.dumps(pattern)}'
+
+
+# Serial payloads and output.txt fields are fixed per emotion, so encode them once up front
+BUZZER_PAYLOADS = {emotion: _encode_pattern(pattern) for emotion, pattern in BUZZER_PATTERNS.items()}
+_OUTPUT_FIELDS = {emotion: _output_fields(emotion, pattern) for emotion, pattern in BUZZER_PATTERNS.items()}
+
+# Fallback payloads for unknown emotions, keyed by beep count (filled on demand)
+_fallback_payloads = {}
+
+# Upper-case display names for the console line
+_UPPER = {emotion: emotion.upper() for emotion in config.EMOTION_TO_VIBRATION}
+
+
 def init_serial():
     """Initialize serial connection to Arduino/hardware."""
     global serial_connection
@@ -51,15 +90,71 @@ def init_serial():
         serial_connection = serial.Serial(
             port=config.SERIAL_PORT,
             baudrate=config.SERIAL_BAUD_RATE,
-            timeout=1
+            timeout=0.1
         )
+        # Shrink the USB-serial latency timer (FTDI defaults to 16 ms).
+        # Only supported on Linux; other platforms just keep the default.
+        try:
+            serial_connection.set_low_latency_mode(True)
+        except (OSError, ValueError, NotImplementedError, AttributeError):
+            pass
         print(f"[OK] Connected to hardware on {config.SERIAL_PORT}")
+        _start_serial_writer()
         return True
     except Exception as e:
         print(f"[ERROR] Could not connect to hardware: {e}")
         return False
 
 
+def _start_serial_writer():
+    """Start the daemon thread that drains _tx_queue to the serial port."""
+    global _tx_thread
+
+    if _tx_thread is not None and _tx_thread.is_alive():
+        return
+
+    def _writer():
+        while True:
+            payload = _tx_queue.get()
+            if payload is _TX_STOP:
+                break
+            try:
+                serial_connection.write(payload)
+            except Exception as e:
+                print(f"Warning: Could not send to serial: {e}")
+
+    _tx_thread = threading.Thread(target=_writer, name="serial-writer", daemon=True)
+    _tx_thread.start()
+
+
+def _queue_serial_payload(payload: bytes):
+    """Hand a payload to the writer thread, dropping the oldest one if backed up."""
+    while True:
+        try:
+            _tx_queue.put_nowait(payload)
+            return
+        except queue.Full:
+            try:
+                _tx_queue.get_nowait()
+            except queue.Empty:
+                pass
+
+
+def _write_output_file(buf: bytes):
+    """Replace output.txt with buf; readers see either the old or the new file, never a mix."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    with _output_lock:
+        try:
+            fd = os.open(_OUTPUT_TMP_PATH, flags, 0o644)
+            try:
+                os.write(fd, buf)
+            finally:
+                os.close(fd)
+            os.replace(_OUTPUT_TMP_PATH, _OUTPUT_PATH)
+        except OSError as e:
+            print(f"Warning: Could not write to file: {e}")
+
+
 def send_vibration(vibration_count: int, emotion: str, confidence: float):
     """
     Send vibration signal to the hardware.
@@ -76,52 +171,62 @@ def send_vibration(vibration_count: int, emotion: str, confidence: float):
         How confident the detection is (0.0 to 1.0)
     """
     
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    # Same layout as strftime("%Y-%m-%d %H:%M:%S") without the locale-aware call
+    now = datetime.now()
+    timestamp = (f"{now.year:04d}-{now.month:02d}-{now.day:02d} "
+                 f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}")
+    confidence_rounded = round(confidence, 2)
     
     # Pick buzzer pattern; fall back to simple repeated beeps based on count
     pattern = BUZZER_PATTERNS.get(emotion)
-    if pattern is None:
+    if pattern is not None:
+        payload = BUZZER_PAYLOADS[emotion]
+        fields = _OUTPUT_FIELDS[emotion]
+    else:
         # unknown emotion: reuse count as N quick beeps
-        pattern = [150] * max(vibration_count, 1)
-    # Flatten to comma-separated millisecond pulses for the Arduino sketch
-    pattern_str = ",".join(str(p) for p in pattern if p > 0)
+        beeps = max(vibration_count, 1)
+        pattern = [150] * beeps
+        payload = _fallback_payloads.get(beeps)
+        if payload is None:
+            payload = _fallback_payloads[beeps] = _encode_pattern(pattern)
+        fields = _output_fields(emotion, pattern)
 
     # Create data packet
     data = {
         "timestamp": timestamp,
         "emotion": emotion,
         "buzzer_pattern": pattern,
-        "confidence": round(confidence, 2)
+        "confidence": confidence_rounded
     }
     
     # Output to console
     if config.OUTPUT_TO_CONSOLE:
-        beeps = len(pattern)
-        print(f"[{timestamp}] {emotion.upper()} (confidence: {confidence:.0%}) -> {beeps} beep(s) [{pattern_str}]")
+        # Comma-separated millisecond pulses, as sent to the Arduino sketch
+        pattern_str = payload[2:-1].decode()
+        emotion_upper = _UPPER.get(emotion) or emotion.upper()
+        print(f"[{timestamp}] {emotion_upper} (confidence: {confidence:.0%}) -> {len(pattern)} beep(s) [{pattern_str}]")
     
     # Output to file (for hardware team to read)
     if config.OUTPUT_TO_FILE:
-        try:
-            with open("output.txt", "w") as f:
-                f.write(json.dumps(data))
-        except Exception as e:
-            print(f"Warning: Could not write to file: {e}")
+        # Filled-in template instead of json.dumps on the whole dict
+        buf = _OUTPUT_TEMPLATE.format(timestamp, fields, repr(confidence_rounded)).encode('ascii')
+        _write_output_file(buf)
     
     # Output to serial (for Arduino/hardware)
     if config.OUTPUT_TO_SERIAL and serial_connection:
-        try:
-            # Send format: "B:120,120,200\n" (ms HIGH durations per pulse)
-            message = f"B:{pattern_str}\n"
-            serial_connection.write(message.encode())
-        except Exception as e:
-            print(f"Warning: Could not send to serial: {e}")
+        _queue_serial_payload(payload)
     
     return data
 
 
 def cleanup():
     """Clean up connections when program exits."""
-    global serial_connection
+    global serial_connection, _tx_thread
+    if _tx_thread is not None:
+        # Let queued payloads go out before closing the port
+        _queue_serial_payload(_TX_STOP)
+        _tx_thread.join(timeout=2.0)
+        _tx_thread = None
     if serial_connection:
         serial_connection.close()
         print("Serial connection closed.")
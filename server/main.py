@@ -12,21 +12,24 @@ Press 'Q' to quit (if display window is open)
 Press Ctrl+C in terminal to stop
 """
 
+import asyncio
 import os
 import cv2
+import numpy as np
+import queue
 import time
 import sys
 import threading
-from collections import deque, Counter
-from datetime import datetime
+from collections import deque
 
 from dotenv import load_dotenv
-from flask import Flask, jsonify, request
-from google import genai
+from flask import Flask
 
 # Import our modules
 import config
 import hardware_bridge
+from emotion_history import EMOTION_IDS, EMOTION_LABELS, NO_EMOTION, VIBRATION_TABLE, EmotionHistory
+from routes import register_routes
 
 # Make .env variables available (e.g., GOOGLE_API_KEY)
 load_dotenv()
@@ -39,47 +42,274 @@ except ImportError:
     UI_AVAILABLE = False
     print("Note: UI not available. Install Pillow: pip install Pillow")
 
+# Try to import Hypercorn (optional production server for the Flask app)
+try:
+    from hypercorn.asyncio import serve as hypercorn_serve
+    from hypercorn.config import Config as HypercornConfig
+    HYPERCORN_AVAILABLE = True
+except ImportError:
+    HYPERCORN_AVAILABLE = False
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# Try to import ONNX Runtime (optional, faster emotion model inference)
+try:
+    import onnxruntime as ort
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+
+# Shared in-memory emotion history for the Flask endpoint to read.
+# Sized for the sustain window at the fastest interval the UI slider allows.
+HISTORY_CAPACITY = int(config.SUSTAIN_WINDOW_SECONDS / min(config.DETECTION_INTERVAL, 0.1)) + 4
+analysis_history = EmotionHistory(config.SUSTAIN_WINDOW_SECONDS, HISTORY_CAPACITY)
+
+# Console output from the detection loop is queued and printed by a daemon
+# thread, so a slow terminal never stalls capture or hardware output.
+# Messages are (format, args) and only formatted on the printing thread.
+_console_queue = queue.Queue()
 
-# Shared in-memory emotion history for the Flask endpoint to read
-analysis_history: deque[tuple[float, str | None, float]] = deque()
-analysis_lock = threading.Lock()
 
-# Latest biometrics pushed from clients
-latest_biometrics = {
-    "pulse_average": None,
-    "breathing_average": None,
-    "timestamp": None
-}
-biometrics_lock = threading.Lock()
+def _console_printer():
+    while True:
+        fmt, args = _console_queue.get()
+        print(fmt.format(*args))
+
+
+threading.Thread(target=_console_printer, name="console-log", daemon=True).start()
+
+
+def log_console(fmt, *args):
+    """Queue a line for the console; formatted as fmt.format(*args) off the caller's thread."""
+    _console_queue.put_nowait((fmt, args))
+
 
 # Flask app (runs in a background thread)
 app = Flask(__name__)
+register_routes(app, analysis_history)
+
+# Output order of DeepFace's emotion model (and mini-Xception, both FER2013-trained),
+# mapped onto our emotion ids
+MODEL_EMOTION_LABELS = ['angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'neutral']
+MODEL_TO_EMOTION_ID = np.array([EMOTION_IDS.get(label, NO_EMOTION) for label in MODEL_EMOTION_LABELS])
+
+# Fast Haar face detector used to skip the emotion model on frames with nobody in view
+face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+
+
+def _load_yunet():
+    """Return the YuNet face detector if selected and loadable, else None (Haar is used)."""
+    if config.FACE_DETECTOR != 'yunet':
+        return None
+    try:
+        detector = cv2.FaceDetectorYN_create(config.YUNET_MODEL_PATH, '', tuple(config.ANALYSIS_FRAME_SIZE),
+                                             score_threshold=0.6, nms_threshold=0.3, top_k=5)
+    except (AttributeError, cv2.error) as e:
+        print(f"Warning: YuNet face detector unavailable ({e}), using Haar cascade")
+        return None
+    print("[OK] YuNet face detector loaded")
+    return detector
 
 
-def _get_genai_client():
-    api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("api_key")
-    if not api_key:
-        raise ValueError("Missing GOOGLE_API_KEY (or api_key) environment variable for Gemini.")
-    return genai.Client(api_key=api_key)
+# Not thread-safe; used by warm-up and then only by the analysis worker
+yunet = _load_yunet()
+
+# Contrast enhancement for face crops, built once (used by the analysis worker only)
+clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+
+
+class OnnxEmotionModel:
+    """
+    An ONNX emotion classifier (DeepFace's exported model or mini-Xception)
+    run through ONNX Runtime.
+
+    input_size and channels-first layout are read from the model's input;
+    centered_input=True feeds pixels in [-1, 1] instead of [0, 1].
+    """
+
+    def __init__(self, path, cpu_only=False, centered_input=False):
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # Half the cores: capture, UI and Flask threads need the rest
+        options.intra_op_num_threads = max(1, (os.cpu_count() or 1) // 2)
+        if cpu_only:
+            # INT8 kernels are CPU kernels; GPU providers would fall back anyway
+            providers = ['CPUExecutionProvider']
+        else:
+            # Prefer GPU providers when this onnxruntime build has them
+            preferred = ['TensorrtExecutionProvider', 'CUDAExecutionProvider', 'CPUExecutionProvider']
+            available = ort.get_available_providers()
+            providers = [p for p in preferred if p in available] or available
+        self.session = ort.InferenceSession(path, sess_options=options, providers=providers)
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.channels_first = model_input.shape[1] == 1
+        size = model_input.shape[2] if self.channels_first else model_input.shape[1]
+        self.input_size = size if isinstance(size, int) else 48
+        self.centered_input = centered_input
+
+    def predict(self, batch, verbose=0):
+        """Same call shape as the Keras model: (N, size, size, 1) -> (N, 7) scores."""
+        batch = batch.astype(np.float32, copy=False)
+        if self.channels_first:
+            batch = batch.transpose(0, 3, 1, 2)
+        return self.session.run(None, {self.input_name: batch})[0]
+
+
+class CompiledKerasEmotionModel:
+    """Keras emotion model forward pass wrapped in an XLA-compiled tf.function."""
+
+    def __init__(self, keras_model):
+        import tensorflow as tf
+
+        # Fixed signature with a free batch dim, so it is traced/compiled only once
+        @tf.function(jit_compile=True,
+                     input_signature=[tf.TensorSpec((None, 48, 48, 1), tf.float32)])
+        def forward(batch):
+            return keras_model(batch, training=False)
+
+        self._forward = forward
+
+    def predict(self, batch, verbose=0):
+        """Same call shape as the Keras model: (N, 48, 48, 1) -> (N, 7) scores."""
+        return self._forward(batch.astype(np.float32, copy=False)).numpy()
+
+
+def _export_emotion_onnx(path):
+    """Export DeepFace's Keras emotion model to ONNX (one-time, needs tf2onnx)."""
+    import tensorflow as tf
+    import tf2onnx
+    from deepface import DeepFace
+
+    keras_model = DeepFace.build_model("Emotion").model
+    spec = (tf.TensorSpec((None, 48, 48, 1), tf.float32, name="input"),)
+    tf2onnx.convert.from_keras(keras_model, input_signature=spec, opset=17, output_path=path)
+    print(f"[OK] Exported emotion model to {path}")
+
+
+def _quantize_emotion_onnx(path, int8_path):
+    """Write an INT8 (dynamically quantized weights) copy of the ONNX emotion model."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(path, int8_path, weight_type=QuantType.QInt8)
+    print(f"[OK] Quantized emotion model to {int8_path}")
+
+
+def _convert_emotion_onnx_fp16(path, fp16_path):
+    """Write a float16 copy of the ONNX emotion model (float32 inputs/outputs kept)."""
+    import onnx
+    from onnxconverter_common import float16
+
+    model = float16.convert_float_to_float16(onnx.load(path), keep_io_types=True)
+    onnx.save(model, fp16_path)
+    print(f"[OK] Converted emotion model to float16: {fp16_path}")
+
+
+def _load_onnx_emotion_model():
+    """Return an OnnxEmotionModel, exporting it first if needed, or None on failure."""
+    path = config.ONNX_MODEL_PATH
+    try:
+        if not os.path.exists(path):
+            _export_emotion_onnx(path)
+        if config.ONNX_INT8:
+            int8_path = os.path.splitext(path)[0] + '_int8.onnx'
+            if not os.path.exists(int8_path):
+                _quantize_emotion_onnx(path, int8_path)
+            return OnnxEmotionModel(int8_path, cpu_only=True)
+        if config.USE_FP16:
+            fp16_path = os.path.splitext(path)[0] + '_fp16.onnx'
+            if not os.path.exists(fp16_path):
+                _convert_emotion_onnx_fp16(path, fp16_path)
+            return OnnxEmotionModel(fp16_path)
+        return OnnxEmotionModel(path)
+    except Exception as e:
+        print(f"Warning: ONNX Runtime unavailable for emotion model ({e}), using TensorFlow")
+        return None
+
+
+def _warm_up(emotion_model):
+    """
+    Run the per-frame path on camera-sized input before the loop starts, so
+    one-time setup (OpenCV kernel init, cascade load, GPU kernel/algorithm
+    selection) happens at startup instead of on the first real face.
+    """
+    test_frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+    prepare_face(test_frame)
+    # Batch of the shape the analysis worker will actually send
+    size = getattr(emotion_model, 'input_size', 48)
+    test_batch = np.zeros((config.ANALYSIS_BATCH_SIZE, size, size, 1), dtype=np.float32)
+    # A few passes: GPU backends pick their kernels over the first calls
+    for _ in range(3):
+        emotion_model.predict(test_batch, verbose=0)
+
+
+def _load_mini_xception():
+    """Return the compact mini-Xception ONNX model, or None if it can't be used."""
+    path = config.MINI_XCEPTION_PATH
+    if not ONNX_AVAILABLE:
+        print("Warning: mini_xception backend needs onnxruntime (pip install onnxruntime), using DeepFace")
+        return None
+    if not os.path.exists(path):
+        print(f"Warning: {path} not found, using DeepFace's emotion model")
+        return None
+    try:
+        return OnnxEmotionModel(path, centered_input=True)
+    except Exception as e:
+        print(f"Warning: Could not load {path} ({e}), using DeepFace's emotion model")
+        return None
 
 
 def load_emotion_detector():
-    """Load the DeepFace emotion detection model."""
+    """
+    Load the emotion classifier: mini-Xception (if selected in config), or
+    DeepFace's model as an ONNX Runtime session or the Keras model itself.
+
+    Faces are found and cropped here with the Haar cascade, so the model is
+    called directly on batches of small grayscale crops rather than through
+    DeepFace.analyze, which only takes one image at a time.
+    """
     print("Loading emotion detection model... (this may take a moment)")
+
+    if config.EMOTION_BACKEND == 'mini_xception':
+        emotion_model = _load_mini_xception()
+        if emotion_model is not None:
+            _warm_up(emotion_model)
+            print("[OK] Emotion detection model loaded successfully! (mini-Xception)")
+            return emotion_model
+
+    if config.USE_ONNX_RUNTIME and ONNX_AVAILABLE:
+        emotion_model = _load_onnx_emotion_model()
+        if emotion_model is not None:
+            _warm_up(emotion_model)
+            print("[OK] Emotion detection model loaded successfully! (ONNX Runtime)")
+            return emotion_model
     
     try:
         from deepface import DeepFace
+
+        if config.USE_FP16:
+            # Layers built from here on compute in float16 (weights stay float32 masters)
+            from tensorflow.keras import mixed_precision
+            mixed_precision.set_global_policy('mixed_float16')
         
-        # Warm up the model with a test image
-        import numpy as np
-        test_img = np.zeros((48, 48, 3), dtype=np.uint8)
-        try:
-            DeepFace.analyze(test_img, actions=['emotion'], enforce_detection=False)
-        except:
-            pass  # Warm-up may fail on blank image, that's okay
+        emotion_model = DeepFace.build_model("Emotion").model
+        if config.JIT_BACKEND == 'xla':
+            try:
+                compiled = CompiledKerasEmotionModel(emotion_model)
+                # Pays the compile cost here, not on the first face
+                compiled.predict(np.zeros((config.ANALYSIS_BATCH_SIZE, 48, 48, 1), dtype=np.float32))
+                emotion_model = compiled
+            except Exception as e:
+                print(f"Warning: XLA compilation failed ({e}), running the model eagerly")
+        _warm_up(emotion_model)
         
         print("[OK] Emotion detection model loaded successfully!")
-        return DeepFace
+        return emotion_model
     
     except ImportError as e:
         print("\n[ERROR] Required libraries not installed!")
@@ -102,212 +332,307 @@ def start_camera():
         print("  3. Try changing CAMERA_INDEX in config.py (try 0, 1, or 2)")
         sys.exit(1)
     
+    # Ask for MJPG (before the resolution, which some drivers require) to cut
+    # USB bandwidth; cameras that don't support it keep their default format
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
     # Set camera resolution (lower = faster processing)
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    # Keep the driver queue short so grab() always lands on a fresh frame
+    if not cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+        print("Warning: Could not reduce camera buffer size; frames may lag behind")
     
     print("[OK] Camera started successfully!")
     return cap
 
 
-def analyze_frame(DeepFace, frame):
-    """Analyze a single frame for emotions."""
-    try:
-        # Resize for consistency
-        frame_resized = cv2.resize(frame, (640, 480))
-
-        # Improve contrast
-        lab = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2LAB)
-        l, a, b = cv2.split(lab)
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        l = clahe.apply(l)
-        enhanced = cv2.merge([l, a, b])
-        frame_enhanced = cv2.cvtColor(enhanced, cv2.COLOR_LAB2BGR)
-
-        results = DeepFace.analyze(
-            frame_enhanced, 
-            actions=['emotion'],
-            detector_backend='ssd',  # More accurate face detection
-            enforce_detection=False,  # Don't crash if no face found
-            silent=True
-        )
-        
-        if results and len(results) > 0:
-            result = results[0]
-            dominant_emotion = result['dominant_emotion']
-            confidence = result['emotion'][dominant_emotion] / 100.0
-            return dominant_emotion, confidence
-        
-        return None, 0.0
-    
-    except Exception as e:
-        return None, 0.0
-
-
-def _recent_emotions(window_seconds: float = 5.0):
-    """Return recent (timestamp, emotion, confidence) samples within window."""
-    cutoff = time.time() - window_seconds
-    with analysis_lock:
-        return [(ts, emo, conf) for (ts, emo, conf) in analysis_history if ts >= cutoff and emo]
-
-
-def _build_gemini_prompt(samples: list[tuple[float, str, float]]):
-    """Craft a concise prompt instructing Gemini to return one emotion word."""
-    counts: Counter[str] = Counter()
-    for _, emo, conf in samples:
-        if emo:
-            counts[emo] += 1
-    top_emo, top_count = counts.most_common(1)[0]
-
-    with biometrics_lock:
-        pulse = latest_biometrics["pulse_average"]
-        breath = latest_biometrics["breathing_average"]
-        b_ts = latest_biometrics["timestamp"]
-    biometrics_summary = (
-        f"Biometrics (latest): pulse={pulse}, breathing={breath}, timestamp={b_ts}"
-    )
-
-    prompt = (
-        "You are an emotion summarizer. "
-        "Given recent emotion detections, return ONLY the single dominant emotion word "
-        "from the list, no punctuation or extra words.\n\n"
-        f"{biometrics_summary}\n\n"
-        f"Samples in last {len(samples)} frames:\n"
-    )
-    for _, emo, conf in samples:
-        prompt += f"- {emo} ({conf:.0%} confidence)\n"
-    prompt += (
-        f"\nDetected dominant emotion by count: {top_emo} ({top_count} samples). "
-        "Respond with that dominant emotion unless evidence strongly contradicts it."
-    )
-    return prompt, top_emo
-
-
-@app.route("/gemini", methods=["POST", "GET"])
-def gemini_endpoint():
-    """
-    Returns a single emotion word based on the last few seconds of detections.
-    Optional query param: window (seconds, default 5).
+class LatestFrame:
     """
-    try:
-        window = float(request.args.get("window", 5))
-    except ValueError:
-        window = 5.0
-
-    samples = _recent_emotions(window)
-    if not samples:
-        return jsonify({
-            "status": "error",
-            "message": f"No emotion samples in the last {window} seconds"
-        }), 404
-
-    counts = Counter(emo for _, emo, _ in samples if emo)
-    prompt, fallback_emotion = _build_gemini_prompt(samples)
-    proportion = counts.get(fallback_emotion, 0) / float(len(samples) or 1)
-
-    model_text = ""
-    signal_payload = None
-    source = "gemini"
-    error_msg = None
-    try:
-        client = _get_genai_client()
-        response = client.models.generate_content(
-            model="gemini-3-flash-preview",
-            contents=prompt
-        )
-        model_text = (getattr(response, "text", "") or "").strip()
-        # Keep only the first word to enforce a single emotion token
-        one_word = model_text.split()[0] if model_text else fallback_emotion
-    except Exception as e:
-        # Fall back to the locally computed dominant emotion
-        one_word = fallback_emotion
-        source = "local_fallback"
-        error_msg = str(e)
-
-    if config.ENABLE_SIGNAL_ON_API:
-        vibrations = config.EMOTION_TO_VIBRATION.get(one_word, 0)
-        if vibrations > 0:
-            # Use proportion of samples as a rough confidence signal
-            signal_payload = hardware_bridge.send_vibration(
-                vibrations, one_word, max(proportion, 0.01)
-            )
-
-    response_payload = {
-        "status": "ok",
-        "emotion": one_word,
-        "gemini_raw": model_text,
-        "samples_used": len(samples),
-        "signal_triggered": bool(signal_payload),
-        "source": source
-    }
-    if error_msg:
-        response_payload["error"] = error_msg
-    if signal_payload:
-        response_payload["signal_payload"] = signal_payload
-
-    return jsonify(response_payload), 200
+    Triple-buffered newest camera frame: one capture thread, one consumer.
 
-
-@app.route("/biometrics", methods=["POST"])
-def receive_biometrics():
+    The capture thread decodes into its back buffer and publishes it as the
+    ready frame; get() swaps the ready frame into the consumer's front
+    buffer. The capture thread never writes the front buffer, so the
+    consumer can use (and draw on) it in place until its next get().
+    Anything kept longer than that must be copied.
     """
-    POST endpoint to receive biometric data from a client.
 
-    Expected JSON format:
-    {
-        "pulse_average": float,
-        "breathing_average": float
-    }
+    def __init__(self, wake_event=None):
+        self.lock = threading.Lock()
+        self.wake_event = wake_event  # set on every new frame, if given
+        self._back = None    # capture thread's buffer
+        self._ready = None   # newest complete frame
+        self._front = None   # consumer's buffer
+        self._ready_at = 0.0
+        self._front_at = 0.0
+        self.version = 0  # bumped on every new frame
+        self._front_version = 0
+        self.read_failed = False
+
+    def back_buffer(self):
+        """Buffer for the capture thread to decode into (None until the pool is filled)."""
+        return self._back
+
+    def publish(self, frame, captured_at):
+        with self.lock:
+            self._back, self._ready = self._ready, frame
+            self._ready_at = captured_at
+            self.version += 1
+            self.read_failed = False
+        if self.wake_event is not None:
+            self.wake_event.set()
+
+    def mark_failed(self):
+        with self.lock:
+            self.read_failed = True
+
+    def get(self):
+        """Return (frame, version, captured_at, read_failed) for the most recent frame."""
+        with self.lock:
+            if self.version != self._front_version:
+                self._front, self._ready = self._ready, self._front
+                self._front_at = self._ready_at
+                self._front_version = self.version
+            return self._front, self._front_version, self._front_at, self.read_failed
+
+
+def pin_current_thread(role):
+    """
+    Pin the calling thread to its own cores when config.PIN_THREADS is on
+    (Linux only): 'capture' gets the first allowed core, 'analysis' the rest.
     """
+    if not (config.PIN_THREADS and hasattr(os, 'sched_setaffinity')):
+        return
+    cpus = sorted(os.sched_getaffinity(0))
+    if len(cpus) < 2:
+        return
+    target = {cpus[0]} if role == 'capture' else set(cpus[1:])
     try:
-        data = request.get_json()
-        if data is None:
-            return jsonify({"status": "error", "message": "No JSON data received"}), 400
+        os.sched_setaffinity(threading.get_native_id(), target)
+    except OSError as e:
+        log_console("Warning: Could not pin {} thread to CPUs {}: {}", role, sorted(target), e)
+
+
+def grab_loop(cap, latest, stop_event):
+    """Capture thread: keep reading the camera into `latest` so the driver queue never backs up."""
+    pin_current_thread('capture')
+    while not stop_event.is_set():
+        if cap.grab():
+            # Decode straight into a recycled buffer (allocates only for the first few frames)
+            buf = latest.back_buffer()
+            ret, frame = cap.retrieve(buf) if buf is not None else cap.retrieve()
+            if ret:
+                latest.publish(frame, time.time())
+                continue
+        latest.mark_failed()
+        time.sleep(0.1)
 
-        if "pulse_average" not in data or "breathing_average" not in data:
-            return jsonify({"status": "error", "message": "Missing pulse_average or breathing_average"}), 400
 
-        pulse_avg = data.get("pulse_average")
-        breathing_avg = data.get("breathing_average")
+# Per-thread scratch buffers for the fixed-size per-frame intermediates
+_scratch = threading.local()
 
-        if not isinstance(pulse_avg, (int, float)) or not isinstance(breathing_avg, (int, float)):
-            return jsonify({"status": "error", "message": "pulse_average and breathing_average must be numeric"}), 400
 
-        with biometrics_lock:
-            latest_biometrics["pulse_average"] = float(pulse_avg)
-            latest_biometrics["breathing_average"] = float(breathing_avg)
-            latest_biometrics["timestamp"] = datetime.now().isoformat()
+def _scratch_buffer(name, shape):
+    """Return this thread's reusable uint8 buffer `name` with the given shape."""
+    buf = getattr(_scratch, name, None)
+    if buf is None or buf.shape != shape:
+        buf = np.empty(shape, dtype=np.uint8)
+        setattr(_scratch, name, buf)
+    return buf
 
-        print(f"[BIOMETRICS {latest_biometrics['timestamp']}] pulse={pulse_avg} breathing={breathing_avg}")
 
-        return jsonify({
-            "status": "success",
-            "data": {
-                "pulse_average": pulse_avg,
-                "breathing_average": breathing_avg,
-                "timestamp": latest_biometrics["timestamp"]
-            }
-        }), 200
+def find_largest_face(frame):
+    """
+    Return (x, y, w, h) of the largest face in a BGR frame, or None.
+
+    Expects the already-downscaled analysis frame. The box is the face
+    itself, ready to be fed to the emotion model without another detector.
+    """
+    if yunet is not None:
+        return _find_largest_face_yunet(frame)
+    if face_cascade.empty():
+        # Cascade file missing: treat the whole frame as the face
+        h, w = frame.shape[:2]
+        return 0, 0, w, h
+
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=_scratch_buffer('detect_gray', frame.shape[:2]))
+    # Skipping the smallest scales (faces too far away to read anyway) is
+    # where most of the cascade's time goes
+    min_size = (config.MIN_FACE_SIZE, config.MIN_FACE_SIZE)
+    faces = face_cascade.detectMultiScale(gray, 1.2, 5, minSize=min_size)
+    if len(faces) == 0:
+        return None
+
+    x, y, w, h = max(faces, key=lambda f: f[2] * f[3])
+    return int(x), int(y), int(w), int(h)
+
+
+def _find_largest_face_yunet(frame):
+    """find_largest_face with YuNet; boxes are clipped to the frame."""
+    frame_h, frame_w = frame.shape[:2]
+    yunet.setInputSize((frame_w, frame_h))
+    _, faces = yunet.detect(frame)
+    if faces is None:
+        return None
+
+    best = None
+    for face in faces:
+        x, y = max(int(face[0]), 0), max(int(face[1]), 0)
+        w = min(int(face[0] + face[2]), frame_w) - x
+        h = min(int(face[1] + face[3]), frame_h) - y
+        if w < config.MIN_FACE_SIZE or h < config.MIN_FACE_SIZE:
+            continue
+        if best is None or w * h > best[2] * best[3]:
+            best = (x, y, w, h)
+    return best
+
+
+def prepare_face(frame, input_size=48, centered_input=False, out=None):
+    """
+    Find the largest face in a camera frame and return it as the emotion
+    model's input (input_size x input_size x 1 float32 grayscale in [0, 1],
+    or [-1, 1] when centered_input), or None if no face.
+    If out is given, the input is written into it (and out is returned).
+    """
+    # Downscale for analysis (the detection loop usually has already); the
+    # emotion model only sees a tiny crop anyway
+    if (frame.shape[1], frame.shape[0]) == tuple(config.ANALYSIS_FRAME_SIZE):
+        frame_resized = frame
+    else:
+        frame_resized = cv2.resize(frame, config.ANALYSIS_FRAME_SIZE, interpolation=cv2.INTER_AREA)
+
+    # Skip the emotion model entirely when no face is in view
+    face = find_largest_face(frame_resized)
+    if face is None:
+        return None
+    x, y, w, h = face
+    face_roi = frame_resized[y:y + h, x:x + w]
+
+    # Improve contrast. The model only sees grayscale, so CLAHE runs on the
+    # gray crop directly instead of on L of a BGR->LAB->BGR round-trip
+    gray = clahe.apply(cv2.cvtColor(face_roi, cv2.COLOR_BGR2GRAY))
+
+    # Same input DeepFace builds for its emotion model (mini-Xception: 64x64, centered)
+    gray = cv2.resize(gray, (input_size, input_size),
+                      dst=_scratch_buffer('face_gray', (input_size, input_size)))
+    if out is None:
+        out = np.empty((input_size, input_size, 1), dtype=np.float32)
+    if centered_input:
+        np.multiply(gray, 2.0 / 255.0, out=out[..., 0], casting='unsafe')
+        out -= 1.0
+    else:
+        np.multiply(gray, 1.0 / 255.0, out=out[..., 0], casting='unsafe')
+    return out
+
+
+# Reused model input batch, filled in place by prepare_face (analysis worker only)
+_batch_buffer = None
+
+
+def _input_batch(n, input_size):
+    """Return a preallocated (>= n, input_size, input_size, 1) float32 batch buffer."""
+    global _batch_buffer
+    if (_batch_buffer is None or _batch_buffer.shape[0] < n
+            or _batch_buffer.shape[1] != input_size):
+        capacity = max(n, config.ANALYSIS_BATCH_SIZE)
+        _batch_buffer = np.empty((capacity, input_size, input_size, 1), dtype=np.float32)
+    return _batch_buffer
+
+
+def analyze_frames(emotion_model, frames):
+    """
+    Analyze a batch of frames with one model call.
+    Returns [(emotion_id, confidence)] in the same order as frames.
+    """
+    results = [(NO_EMOTION, 0.0)] * len(frames)
+    input_size = getattr(emotion_model, 'input_size', 48)
+    centered_input = getattr(emotion_model, 'centered_input', False)
+    # Faces are written straight into consecutive rows of the reused batch buffer
+    batch = _input_batch(len(frames), input_size)
+    with_face = []
+    for i, frame in enumerate(frames):
+        if prepare_face(frame, input_size, centered_input, out=batch[len(with_face)]) is not None:
+            with_face.append(i)
+    if not with_face:
+        # No face in any frame: the common case, no model call
+        return results
+
+    predictions = np.asarray(emotion_model.predict(batch[:len(with_face)], verbose=0))
+    # One vectorized pass over the whole batch
+    best = predictions.argmax(axis=1)
+    confidences = predictions.max(axis=1) / predictions.sum(axis=1)
+    emotion_ids = MODEL_TO_EMOTION_ID[best]
+    for i, emotion_id, confidence in zip(with_face, emotion_ids.tolist(), confidences.tolist()):
+        results[i] = (emotion_id, confidence)
+    return results
+
+
+def analyze_frame(emotion_model, frame):
+    """Analyze a single frame for emotions. Returns (emotion_id, confidence)."""
+    return analyze_frames(emotion_model, [frame])[0]
+
+
+# Pre-rendered overlay pieces, keyed by what they depend on (signal text / frame size)
+_overlay_sprites = {}
+
+
+def _render_sprite(shape, draw):
+    """
+    Rasterize draw(img) once and return (y, x, pixels, mask) for reblitting.
+
+    draw() runs on an all-0 and an all-1 canvas; pixels it touched come out
+    identical on both, which gives an exact mask without a key colour.
+    """
+    zeros = np.zeros(shape, dtype=np.uint8)
+    ones = np.ones(shape, dtype=np.uint8)
+    draw(zeros)
+    draw(ones)
+    mask = np.all(zeros == ones, axis=2)
+    ys, xs = np.nonzero(mask)
+    if len(ys) == 0:
+        return 0, 0, zeros[:0, :0], mask[:0, :0]
+    y0, y1, x0, x1 = ys.min(), ys.max() + 1, xs.min(), xs.max() + 1
+    return y0, x0, zeros[y0:y1, x0:x1], mask[y0:y1, x0:x1]
+
+
+def _blit_sprite(frame, sprite):
+    y, x, pixels, mask = sprite
+    h, w = mask.shape
+    np.copyto(frame[y:y + h, x:x + w], pixels, where=mask[..., None])
+
+
+def _signal_banner_sprite(signal_text: str):
+    def draw(img):
+        cv2.rectangle(img, (10, 10), (620, 90), (0, 0, 0), -1)
+        cv2.rectangle(img, (10, 10), (620, 90), (255, 255, 255), 2)
+        cv2.putText(img, signal_text, (20, 60),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 255), 2)
+    return _render_sprite((100, 640, 3), draw)
 
-    except Exception as e:
-        return jsonify({"status": "error", "message": str(e)}), 500
+
+def _quit_hint_sprite(frame_height: int):
+    def draw(img):
+        cv2.putText(img, "Press 'Q' to quit", (10, frame_height - 20),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+    return _render_sprite((frame_height, 200, 3), draw)
 
 
 def draw_overlay(frame, signal_text: str | None):
     """Draw only the signal event on the video frame (no analysis details)."""
     if signal_text:
-        cv2.rectangle(frame, (10, 10), (620, 90), (0, 0, 0), -1)
-        cv2.rectangle(frame, (10, 10), (620, 90), (255, 255, 255), 2)
-        cv2.putText(frame, signal_text, (20, 60),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 255), 2)
+        key = ('banner', signal_text)
+        if key not in _overlay_sprites:
+            _overlay_sprites[key] = _signal_banner_sprite(signal_text)
+        _blit_sprite(frame, _overlay_sprites[key])
     # Always draw quit help
-    h = frame.shape[0]
-    cv2.putText(frame, "Press 'Q' to quit", (10, h - 20),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+    key = ('quit', frame.shape[0])
+    if key not in _overlay_sprites:
+        _overlay_sprites[key] = _quit_hint_sprite(frame.shape[0])
+    _blit_sprite(frame, _overlay_sprites[key])
     return frame
 
 
-def run_detection_loop(DeepFace, cap, ui=None, stop_event=None):
+def run_detection_loop(emotion_model, cap, ui=None, stop_event=None):
     """Run the main emotion detection loop in a separate thread."""
     print("\n" + "-"*60)
     print("RUNNING - Point camera at a face to detect emotions")
@@ -323,72 +648,156 @@ def run_detection_loop(DeepFace, cap, ui=None, stop_event=None):
     # For brief on-screen signal message (not analysis)
     last_signal_text = None
     last_signal_shown_at = 0.0
+
+    # Frame-difference gate: thumbnail of the last frame sent for analysis,
+    # and the latest result to reuse while the scene stays the same
+    prev_thumb = None
+    # Thumbnail scratch: one BGR buffer and two gray ones (current + the one kept as prev_thumb)
+    thumb_bgr = np.empty((60, 80, 3), dtype=np.uint8)
+    thumb_grays = [np.empty((60, 80), dtype=np.uint8), np.empty((60, 80), dtype=np.uint8)]
+    thumb_index = 0
+    last_result = None  # (emotion_id, confidence)
+
+    # The emotion model runs on a worker thread fed through a small pending-frame
+    # buffer (oldest frames are dropped when it is full), so slow inference never
+    # stalls capture or the preview. Once ANALYSIS_BATCH_SIZE frames are waiting
+    # they go through the model in one call; results come back through
+    # finished_results, each tagged with its frame's capture time.
+    batch_size = max(1, config.ANALYSIS_BATCH_SIZE)
+    slot_lock = threading.Lock()
+    pending_frames = deque(maxlen=batch_size)  # (frame, capture_time) waiting to be analyzed
+    finished_results = []  # (capture_time, emotion_id, confidence)
+    worker_stop = threading.Event()
+    work_ready = threading.Event()  # set when a frame is queued for analysis
+    worker_busy = False  # a batch is being analyzed (guarded by slot_lock)
+
+    # The loop sleeps on `wake`, which is set when a frame or an analysis result arrives
+    wake = threading.Event()
+
+    def analysis_worker():
+        nonlocal worker_busy
+        pin_current_thread('analysis')
+        while not worker_stop.is_set():
+            work_ready.wait(0.1)
+            work_ready.clear()
+            with slot_lock:
+                batch = list(pending_frames) if len(pending_frames) >= batch_size else None
+                if batch:
+                    pending_frames.clear()
+                    worker_busy = True
+            if batch is None:
+                continue
+            try:
+                results = analyze_frames(emotion_model, [frame for frame, _ in batch])
+            except Exception as e:
+                # A real failure (not "no face"): report it and keep the worker alive
+                log_console("[ERROR] Emotion analysis failed: {}", e)
+                results = [(NO_EMOTION, 0.0)] * len(batch)
+            with slot_lock:
+                finished_results.extend(
+                    (captured_at, emotion_id, confidence)
+                    for (_, captured_at), (emotion_id, confidence) in zip(batch, results))
+                worker_busy = False
+            wake.set()
+
+    worker = threading.Thread(target=analysis_worker, name="emotion-analysis", daemon=True)
+    worker.start()
+
+    # Capture runs on its own thread too; this loop only ever looks at the newest frame
+    latest = LatestFrame(wake)
+    last_frame_version = 0
+    capture_stop = threading.Event()
+    capture_thread = threading.Thread(target=grab_loop, args=(cap, latest, capture_stop),
+                                      name="camera-capture", daemon=True)
+    capture_thread.start()
     
     try:
         while not (stop_event and stop_event.is_set()):
-            # Capture frame
-            ret, frame = cap.read()
-            if not ret:
-                print("Warning: Could not read frame from camera")
+            wake.clear()
+            frame, frame_version, captured_at, read_failed = latest.get()
+            if read_failed:
+                log_console("Warning: Could not read frame from camera")
                 if ui:
                     ui.log("Warning: Could not read frame from camera")
                 time.sleep(0.1)
                 continue
-            
-            current_time = time.time()
-            emotion = None
-            confidence = 0.0
-            
-            # Update UI with video frame (limit to ~30fps for performance)
-            if ui and (current_time - last_video_update >= 0.033):
-                ui.update_video(frame)
-                last_video_update = current_time
-            
-            # Only analyze at specified interval (to save CPU)
-            if current_time - last_detection_time >= config.DETECTION_INTERVAL:
-                last_detection_time = current_time
 
-                # Analyze the frame for emotions
-                emotion, confidence = analyze_frame(DeepFace, frame)
+            current_time = time.time()
+            if frame_version == last_frame_version:
+                frame = None  # nothing new since the last pass
+            else:
+                last_frame_version = frame_version
+                show_video = ui and (current_time - last_video_update >= 0.033)
+                run_analysis = current_time - last_detection_time >= config.DETECTION_INTERVAL
+
+            if frame is not None:
+                # Update UI with video frame (limit to ~30fps for performance)
+                if show_video:
+                    ui.update_video(frame)
+                    last_video_update = current_time
+
+                # Hand a frame to the analysis worker at the specified interval (to save CPU)
+                if run_analysis:
+                    last_detection_time = current_time
+                    # The worker gets its own downscaled copy: the camera buffer is
+                    # only ours until the next latest.get()
+                    small = cv2.resize(frame, config.ANALYSIS_FRAME_SIZE, interpolation=cv2.INTER_AREA)
+                    cv2.resize(small, (80, 60), dst=thumb_bgr, interpolation=cv2.INTER_AREA)
+                    thumb = cv2.cvtColor(thumb_bgr, cv2.COLOR_BGR2GRAY, dst=thumb_grays[thumb_index])
+                    static = (prev_thumb is not None and last_result is not None and
+                              cv2.absdiff(thumb, prev_thumb).mean() < config.MOTION_THRESHOLD)
+                    with slot_lock:
+                        # Only reuse once every earlier frame has its result, so results
+                        # (and the history) stay in capture-time order
+                        static = static and not worker_busy and not pending_frames
+                        if static:
+                            # Nothing moved since the last analyzed frame: same answer, no model call
+                            reuse = finished_results[-1][1:] if finished_results else last_result
+                            finished_results.append((captured_at, *reuse))
+                        else:
+                            pending_frames.append((small, captured_at))
+                            work_ready.set()
+                    if not static:
+                        prev_thumb = thumb
+                        thumb_index ^= 1
+
+            # Pick up finished analyses, oldest first
+            with slot_lock:
+                new_results = finished_results[:]
+                finished_results.clear()
+            for result_ts, emotion_id, confidence in new_results:
+                last_result = (emotion_id, confidence)
+                emotion = EMOTION_LABELS[emotion_id] if emotion_id != NO_EMOTION else None
 
                 # Update UI with current emotion
                 if ui:
                     ui.update_emotion(emotion, confidence)
 
                 # Record analysis result into sliding window
-                with analysis_lock:
-                    analysis_history.append((current_time, emotion, float(confidence or 0.0)))
-                    # Purge old entries outside sustain window
-                    window_start = current_time - config.SUSTAIN_WINDOW_SECONDS
-                    while analysis_history and analysis_history[0][0] < window_start:
-                        analysis_history.popleft()
-
-                # Print all analysis to terminal
-                ts = datetime.now().strftime("%H:%M:%S")
-                if emotion:
-                    print(f"[ANALYSIS {ts}] emotion={emotion:>8}  confidence={confidence:.0%}")
-                    if ui:
-                        ui.log(f"Detected: {emotion} ({confidence:.0%})")
-                else:
-                    print(f"[ANALYSIS {ts}] emotion=None     confidence=0%")
+                # (entries older than the sustain window are dropped on append)
+                analysis_history.append(result_ts, emotion_id, float(confidence or 0.0))
+
+                # Print all analysis to terminal (debug only)
+                if config.DEBUG_ANALYSIS:
+                    ts = time.strftime("%H:%M:%S", time.localtime(result_ts))
+                    if emotion:
+                        log_console("[ANALYSIS {}] emotion={:>8}  confidence={:.0%}", ts, emotion, confidence)
+                    else:
+                        log_console("[ANALYSIS {}] emotion=None     confidence=0%", ts)
+                if emotion and ui:
+                    ui.log(f"Detected: {emotion} ({confidence:.0%})")
 
                 # Check sustained emotion condition only if not muted and auto signaling enabled
-                if config.ENABLE_AUTO_SIGNALING and current_time >= mute_until and analysis_history:
-                    with analysis_lock:
-                        snapshot = list(analysis_history)
-                    total = len(snapshot)
-                    # Count strong-confidence samples by emotion
-                    counts: Counter[str] = Counter()
-                    for _, e, conf in snapshot:
-                        if e and conf >= config.STRONG_CONFIDENCE_THRESHOLD:
-                            counts[e] += 1
-
-                    if counts:
-                        # Find dominant strong emotion
-                        dominant_emotion, strong_count = counts.most_common(1)[0]
+                if config.ENABLE_AUTO_SIGNALING and current_time >= mute_until:
+                    # Dominant strong-confidence emotion; the history keeps these counts
+                    # incrementally, so this is O(number of emotions), not O(window)
+                    dominant_id, strong_count, total = analysis_history.dominant_strong()
+
+                    if dominant_id != NO_EMOTION:
                         ratio = strong_count / float(total)
                         if ratio >= config.SUSTAIN_RATIO:
-                            vibrations = config.EMOTION_TO_VIBRATION.get(dominant_emotion, 0)
+                            dominant_emotion = EMOTION_LABELS[dominant_id]
+                            vibrations = VIBRATION_TABLE[dominant_id]
                             # Only send if there is a non-zero mapping (neutral -> 0)
                             if vibrations > 0:
                                 hardware_bridge.send_vibration(vibrations, dominant_emotion, 1.0)
@@ -401,12 +810,13 @@ def run_detection_loop(DeepFace, cap, ui=None, stop_event=None):
                                     ui.log(f"SIGNAL: {last_signal_text}")
             
             # Fallback: show OpenCV window if UI not available
-            if not ui and show_cv_window:
+            if not ui and show_cv_window and frame is not None:
                 try:
                     signal_text = None
                     if last_signal_text and (current_time - last_signal_shown_at) <= 1.5:
                         signal_text = last_signal_text
-                    display_frame = draw_overlay(frame.copy(), signal_text)
+                    # Safe to draw in place: the analysis worker has its own downscaled copy
+                    display_frame = draw_overlay(frame, signal_text)
                     cv2.imshow('Emotion Detector', display_frame)
                     key = cv2.waitKey(1) & 0xFF
                     if key == ord('q') or key == ord('Q'):
@@ -414,8 +824,8 @@ def run_detection_loop(DeepFace, cap, ui=None, stop_event=None):
                 except Exception:
                     show_cv_window = False
             
-            # Small sleep to prevent tight loop
-            time.sleep(0.01)
+            # Wait for the next frame or result (timeout keeps stop_event responsive)
+            wake.wait(0.1)
     
     except Exception as e:
         print(f"\n[ERROR] Detection loop error: {e}")
@@ -425,16 +835,35 @@ def run_detection_loop(DeepFace, cap, ui=None, stop_event=None):
     finally:
         # Cleanup
         print("\nStopping detection loop...")
+        worker_stop.set()
+        capture_stop.set()
+        worker.join(timeout=2.0)
+        capture_thread.join(timeout=1.0)
         cap.release()
         if not ui:
             cv2.destroyAllWindows()
 
 
+async def _serve_hypercorn():
+    # One worker: analysis_history and latest_biometrics live in this process.
+    # We're off the main thread, so Hypercorn can't install signal handlers;
+    # give it a trigger that never fires (the daemon thread ends with the process).
+    hypercorn_config = HypercornConfig.from_mapping(bind=["0.0.0.0:8080"], accesslog=None)
+    await hypercorn_serve(app, hypercorn_config, shutdown_trigger=asyncio.Event().wait)
+
+
 def start_flask_server():
     """Start the Flask server in a background thread so detection keeps running."""
     def _run():
-        # use_reloader=False to avoid double threads
-        app.run(host="0.0.0.0", port=8080, debug=False, use_reloader=False)
+        if HYPERCORN_AVAILABLE:
+            # Hypercorn (on uvloop when installed) instead of Werkzeug's dev server
+            if UVLOOP_AVAILABLE:
+                uvloop.run(_serve_hypercorn())
+            else:
+                asyncio.run(_serve_hypercorn())
+        else:
+            # use_reloader=False to avoid double threads
+            app.run(host="0.0.0.0", port=8080, debug=False, use_reloader=False)
     thread = threading.Thread(target=_run, daemon=True)
     thread.start()
     return thread
@@ -448,7 +877,7 @@ def main():
     print("="*60 + "\n")
     
     # Load the emotion detection model
-    DeepFace = load_emotion_detector()
+    emotion_model = load_emotion_detector()
     
     # Start Flask API in the background so /gemini can read analysis_history
     flask_thread = start_flask_server()
@@ -488,7 +917,7 @@ def main():
             
             detection_thread = threading.Thread(
                 target=run_detection_loop,
-                args=(DeepFace, cap, ui, stop_event),
+                args=(emotion_model, cap, ui, stop_event),
                 daemon=True
             )
             detection_thread.start()
@@ -504,7 +933,7 @@ def main():
     # Fallback: run detection in main thread if no UI
     if not ui:
         try:
-            run_detection_loop(DeepFace, cap, ui=None, stop_event=None)
+            run_detection_loop(emotion_model, cap, ui=None, stop_event=None)
         except KeyboardInterrupt:
             print("\n\nStopped by user (Ctrl+C)")
     
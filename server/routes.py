@@ -0,0 +1,301 @@
+"""
+API Routes
+==========
+Flask endpoints for the iOS app, registered on main.py's app:
+
+  POST /biometrics  - latest pulse and breathing averages from the client
+  GET/POST /gemini  - one summarized emotion word for the last few seconds
+                      of detections (Gemini, with a local fallback)
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+from flask import Blueprint, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+from google import genai
+
+import config
+import hardware_bridge
+from emotion_history import EMOTION_LABELS
+
+# Try to import orjson (optional, faster JSON for the Flask endpoints)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+bp = Blueprint('vibe', __name__)
+
+# Emotion history the /gemini endpoint reads (set by register_routes)
+_history = None
+
+# Latest biometrics pushed from clients: (pulse_average, breathing_average, timestamp).
+# Replaced as a whole tuple, so readers get a consistent snapshot without a lock
+latest_biometrics = (None, None, None)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson, used by jsonify and request.get_json.
+
+    jsonify responses match DefaultJSONProvider (sorted keys, compact or
+    indented layout, trailing newline), except that non-ASCII text is
+    written as UTF-8 rather than \\u escapes. dumps() and calls with
+    json.loads keyword arguments are left to DefaultJSONProvider.
+    """
+
+    def _option(self, indent=False):
+        option = orjson.OPT_SORT_KEYS if self.sort_keys else 0
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Same argument handling as DefaultJSONProvider.response
+        if args and kwargs:
+            raise TypeError("app.json.response() takes either args or kwargs, not both")
+        if kwargs:
+            obj = kwargs
+        elif not args:
+            obj = None
+        elif len(args) == 1:
+            obj = args[0]
+        else:
+            obj = list(args)
+
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._option(indent) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+# One Gemini client for the whole process, so its HTTP connection pool
+# (and TLS sessions) are reused across requests
+_genai_client = None
+_genai_client_lock = threading.Lock()
+
+
+def _get_genai_client():
+    global _genai_client
+    if _genai_client is None:
+        with _genai_client_lock:
+            if _genai_client is None:
+                api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("api_key")
+                if not api_key:
+                    raise ValueError("Missing GOOGLE_API_KEY (or api_key) environment variable for Gemini.")
+                _genai_client = genai.Client(api_key=api_key,
+                                             http_options={"timeout": int(config.GEMINI_TIMEOUT_SECONDS * 1000)})  # ms
+    return _genai_client
+
+
+# Gemini requests run through google-genai's async client on one persistent
+# event loop, so concurrent /gemini calls share a loop (and its connections)
+# instead of each blocking on its own HTTP round-trip
+_gemini_loop = None
+_gemini_loop_lock = threading.Lock()
+
+
+def _get_gemini_loop():
+    global _gemini_loop
+    with _gemini_loop_lock:
+        if _gemini_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="gemini-io", daemon=True).start()
+            _gemini_loop = loop
+    return _gemini_loop
+
+
+def _generate_content(prompt: str):
+    """Ask Gemini for a completion; waits at most config.GEMINI_TIMEOUT_SECONDS."""
+    client = _get_genai_client()
+    future = asyncio.run_coroutine_threadsafe(
+        client.aio.models.generate_content(model="gemini-3-flash-preview", contents=prompt),
+        _get_gemini_loop(),
+    )
+    try:
+        return future.result(timeout=config.GEMINI_TIMEOUT_SECONDS)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise TimeoutError(f"Gemini did not answer within {config.GEMINI_TIMEOUT_SECONDS}s")
+
+
+# Above this many samples the prompt lists per-emotion totals instead of every sample
+PROMPT_MAX_SAMPLE_LINES = 50
+
+
+def _recent_emotions(window_seconds: float = 5.0):
+    """Return (emotion_ids, confidences) arrays of detected samples within window."""
+    return _history.samples_since(time.time() - window_seconds)
+
+
+def _dominant_emotion(emotion_ids):
+    """
+    Return (emotion_id, count, per-emotion counts) for the most frequent id.
+    Ties go to the emotion seen first, as Counter.most_common did.
+    """
+    counts = np.bincount(emotion_ids, minlength=len(EMOTION_LABELS))
+    top_count = counts.max()
+    top_id = emotion_ids[np.argmax(counts[emotion_ids] == top_count)]
+    return int(top_id), int(top_count), counts
+
+
+def _build_gemini_prompt(emotion_ids, confidences):
+    """
+    Craft a concise prompt instructing Gemini to return one emotion word.
+    Returns (prompt, dominant emotion, its sample count).
+    """
+    top_id, top_count, counts = _dominant_emotion(emotion_ids)
+    top_emo = EMOTION_LABELS[top_id]
+    n_samples = len(emotion_ids)
+
+    pulse, breath, b_ts = latest_biometrics
+    biometrics_summary = (
+        f"Biometrics (latest): pulse={pulse}, breathing={breath}, timestamp={b_ts}"
+    )
+
+    prompt = (
+        "You are an emotion summarizer. "
+        "Given recent emotion detections, return ONLY the single dominant emotion word "
+        "from the list, no punctuation or extra words.\n\n"
+        f"{biometrics_summary}\n\n"
+        f"Samples in last {n_samples} frames:\n"
+    )
+    if n_samples <= PROMPT_MAX_SAMPLE_LINES:
+        prompt += "".join(f"- {EMOTION_LABELS[e]} ({c:.0%} confidence)\n"
+                          for e, c in zip(emotion_ids.tolist(), confidences.tolist()))
+    else:
+        # Long windows: one line per emotion (count, mean confidence) keeps the prompt short
+        conf_sums = np.bincount(emotion_ids, weights=confidences, minlength=len(EMOTION_LABELS))
+        for e in np.flatnonzero(counts).tolist():
+            prompt += (f"- {EMOTION_LABELS[e]}: {counts[e]} samples "
+                       f"({conf_sums[e] / counts[e]:.0%} mean confidence)\n")
+    prompt += (
+        f"\nDetected dominant emotion by count: {top_emo} ({top_count} samples). "
+        "Respond with that dominant emotion unless evidence strongly contradicts it."
+    )
+    return prompt, top_emo, top_count
+
+
+@bp.route("/gemini", methods=["POST", "GET"])
+def gemini_endpoint():
+    """
+    Returns a single emotion word based on the last few seconds of detections.
+    Optional query param: window (seconds, default 5).
+    """
+    try:
+        window = float(request.args.get("window", 5))
+    except ValueError:
+        window = 5.0
+
+    emotion_ids, confidences = _recent_emotions(window)
+    n_samples = len(emotion_ids)
+    if not n_samples:
+        return jsonify({
+            "status": "error",
+            "message": f"No emotion samples in the last {window} seconds"
+        }), 404
+
+    prompt, fallback_emotion, top_count = _build_gemini_prompt(emotion_ids, confidences)
+    proportion = top_count / float(n_samples)
+
+    model_text = ""
+    signal_payload = None
+    source = "gemini"
+    error_msg = None
+    try:
+        response = _generate_content(prompt)
+        model_text = (getattr(response, "text", "") or "").strip()
+        # Keep only the first word to enforce a single emotion token
+        one_word = model_text.split()[0] if model_text else fallback_emotion
+    except Exception as e:
+        # Fall back to the locally computed dominant emotion
+        one_word = fallback_emotion
+        source = "local_fallback"
+        error_msg = str(e)
+
+    if config.ENABLE_SIGNAL_ON_API:
+        vibrations = config.EMOTION_TO_VIBRATION.get(one_word, 0)
+        if vibrations > 0:
+            # Use proportion of samples as a rough confidence signal
+            signal_payload = hardware_bridge.send_vibration(
+                vibrations, one_word, max(proportion, 0.01)
+            )
+
+    response_payload = {
+        "status": "ok",
+        "emotion": one_word,
+        "gemini_raw": model_text,
+        "samples_used": n_samples,
+        "signal_triggered": bool(signal_payload),
+        "source": source
+    }
+    if error_msg:
+        response_payload["error"] = error_msg
+    if signal_payload:
+        response_payload["signal_payload"] = signal_payload
+
+    return jsonify(response_payload), 200
+
+
+@bp.route("/biometrics", methods=["POST"])
+def receive_biometrics():
+    """
+    POST endpoint to receive biometric data from a client.
+
+    Expected JSON format:
+    {
+        "pulse_average": float,
+        "breathing_average": float
+    }
+    """
+    global latest_biometrics
+    try:
+        data = request.get_json()
+        if data is None:
+            return jsonify({"status": "error", "message": "No JSON data received"}), 400
+
+        if "pulse_average" not in data or "breathing_average" not in data:
+            return jsonify({"status": "error", "message": "Missing pulse_average or breathing_average"}), 400
+
+        pulse_avg = data.get("pulse_average")
+        breathing_avg = data.get("breathing_average")
+
+        if not isinstance(pulse_avg, (int, float)) or not isinstance(breathing_avg, (int, float)):
+            return jsonify({"status": "error", "message": "pulse_average and breathing_average must be numeric"}), 400
+
+        timestamp = datetime.now().isoformat()
+        latest_biometrics = (float(pulse_avg), float(breathing_avg), timestamp)
+
+        print(f"[BIOMETRICS {timestamp}] pulse={pulse_avg} breathing={breathing_avg}")
+
+        return jsonify({
+            "status": "success",
+            "data": {
+                "pulse_average": pulse_avg,
+                "breathing_average": breathing_avg,
+                "timestamp": timestamp
+            }
+        }), 200
+
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+def register_routes(app, history):
+    """Register the API endpoints on app; /gemini summarizes samples from history."""
+    global _history
+    _history = history
+    if ORJSON_AVAILABLE:
+        app.json = OrjsonProvider(app)
+    app.register_blueprint(bp)
@@ -17,4 +17,13 @@ with serial.Serial(port, baud, timeout=1) as ser:
     for payload in ("B:200,200,200\n", "B:500\n", "B:80,80,300,80\n"):
         print("Sending", payload.strip())
         ser.write(payload.encode())
-        time.sleep(1.5)
+        ser.flush()
+        # The sketch answers "OK: ..." once the pattern has played (or "ERR: ...")
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            resp = ser.readline().decode(errors="ignore").strip()
+            if resp.startswith(("OK", "ERR")):
+                print("  ", resp)
+                break
+        else:
+            print("   warning: no reply from the board")
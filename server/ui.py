@@ -8,14 +8,82 @@ Includes keyboard navigation with audio descriptions for accessibility.
 import tkinter as tk
 from tkinter import ttk, scrolledtext
 import cv2
+import numpy as np
 from PIL import Image, ImageTk
+import queue
+import statistics
 import threading
 import time
-from collections import deque
-from datetime import datetime
+from collections import Counter, deque
 import subprocess
 import platform
 
+import config
+
+# Optional in-process speech on Linux (no process launch per announcement)
+# via speech-dispatcher's Python bindings. macOS keeps using `say`: AppKit's
+# synthesizer would have to be driven from the main thread, not the TTS worker
+try:
+    import speechd
+    SPEECHD_AVAILABLE = True
+except ImportError:
+    SPEECHD_AVAILABLE = False
+
+# Text-to-speech command for announcements on this platform (None = silent);
+# used when no in-process synthesizer is available
+SPEECH_COMMAND = {'Darwin': 'say', 'Linux': 'espeak'}.get(platform.system())
+
+
+def _open_native_speech():
+    """Return speak(message) backed by an in-process synthesizer, or None."""
+    if SPEECHD_AVAILABLE:
+        try:
+            client = speechd.SSIPClient('vibesense')
+        except Exception:
+            return None  # speech-dispatcher not running
+        def speak(message):
+            client.cancel()
+            client.speak(message)
+        return speak
+    return None
+
+# Size of the live video display (width, height)
+DISPLAY_SIZE = (640, 480)
+
+# How often the Tk thread applies updates queued by other threads, and how
+# many it applies per pass (the rest wait for the next pass)
+UI_QUEUE_POLL_MS = 16
+UI_QUEUE_MAX_BATCH = 50
+
+# Arrow-key slider steps arriving within this window are applied together,
+# and the new value is logged once the slider has been still this long
+SLIDER_STEP_COALESCE_MS = 16
+SLIDER_LOG_DELAY_MS = 300
+
+# Lines kept in the activity log. Old lines are trimmed in one batch once
+# the log has grown this many lines past the limit
+MAX_LOG_LINES = 200
+LOG_TRIM_BATCH = 200
+
+# Log messages are buffered and written to the log widget together, this
+# long after the first one arrives
+LOG_FLUSH_MS = 100
+
+# The statistics panel is redrawn at most this often
+STATS_REFRESH_SECONDS = 1.0
+
+# Frames arriving faster than this are not drawn (the camera may run faster)
+DISPLAY_MAX_FPS = 30
+
+# When drawing a frame gets slow, the display rate is lowered so video takes
+# at most this share of the Tk thread (averaged over the last few draws)
+DISPLAY_MAX_DRAW_SHARE = 0.5
+DRAW_TIME_SAMPLES = 30
+
+# Display rate and frame-interval p95 shown in the statistics panel, over
+# the last this many drawn frames
+FRAME_TIME_SAMPLES = 120
+
 
 class EmotionDetectorUI:
     """Main UI window for emotion detector."""
@@ -37,9 +105,25 @@ class EmotionDetectorUI:
         # State variables
         self.current_emotion = None
         self.current_confidence = 0.0
+        self._shown_emotion_state = None  # (emotion, rounded confidence) on screen
         self.last_signal_text = None
         self.camera_frame = None
         self.video_label = None
+        self._last_display_ts = 0.0
+        self._display_interval = 1.0 / DISPLAY_MAX_FPS
+        self._draw_times = deque(maxlen=DRAW_TIME_SAMPLES)  # Tk thread only
+        self._frame_times = deque(maxlen=FRAME_TIME_SAMPLES)  # draw timestamps, Tk thread only
+        # Display frames are converted into one reused RGB buffer. Only one
+        # frame is in flight: until Tk has drawn it, new frames are dropped,
+        # so the buffer is never rewritten during a paste
+        width, height = DISPLAY_SIZE
+        self._rgb_buffer = np.empty((height, width, 3), dtype=np.uint8)
+        self._resize_buffer = np.empty((height, width, 3), dtype=np.uint8)
+        self._draw_scheduled = False  # a frame is waiting for or being drawn by Tk
+        # Widgets may only be touched from the thread that created the root;
+        # calls from the detection thread are queued and applied by that thread
+        self._tk_thread = threading.current_thread()
+        self._ui_queue = queue.Queue()
         self.running = True
         self.update_callback = update_callback
         
@@ -49,11 +133,27 @@ class EmotionDetectorUI:
         
         # History for statistics
         self.emotion_history = deque(maxlen=100)
+        self._emotion_counts = Counter()  # kept in step with emotion_history
+        self._stats_last_render = 0.0
+        self._stats_refresh_pending = False
+        self._display_stats_text = "Display: no frames"
+        self._log_lines = 0  # lines currently in the activity log
+        self._log_buffer = deque()  # entries not yet written to the log widget
+        self._log_flush_pending = False
         
         # Keyboard navigation state
         self.focused_control_index = 0
-        self.focusable_controls = []  # List of (widget, name, type) tuples
+        self.focusable_controls = []  # Control dicts, see _register_control
+        self._slider_control = None   # slider with arrow-key steps not yet applied
+        self._slider_steps = 0
+        self._slider_flush_job = None
+        self._slider_log_job = None
+        self._pending_setting_logs = {}  # setting key -> latest change message
+        self._setting_log_job = None
         self.audio_enabled = True  # Enable audio descriptions
+        # One speech worker; holds only the newest announcement not yet spoken
+        self._speech_queue = queue.Queue(maxsize=1)
+        threading.Thread(target=self._speech_worker, name="tts", daemon=True).start()
         
         # Create UI components
         self._create_widgets()
@@ -61,8 +161,9 @@ class EmotionDetectorUI:
         # Setup keyboard navigation
         self._setup_keyboard_navigation()
         
-        # Start update loop
-        self._update_loop()
+        # Start applying updates from other threads
+        self.root.after(UI_QUEUE_POLL_MS, self._drain_ui_queue)
+        self.root.after(int(STATS_REFRESH_SECONDS * 1000), self._refresh_display_stats)
         
         # Handle window closing
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -82,7 +183,17 @@ class EmotionDetectorUI:
                                    bg='#2b2b2b', fg='white', font=('Arial', 12, 'bold'))
         video_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
         
-        self.video_label = tk.Label(video_frame, bg='black', text="Initializing camera...")
+        # One display image, repainted in place for every frame
+        self.video_photo = ImageTk.PhotoImage('RGB', DISPLAY_SIZE)
+        # Paste one blank frame through the same path now, so PIL's Tk bridge
+        # is loaded at startup instead of stalling the first camera frame
+        blank = self._rgb_buffer
+        blank.fill(0)
+        self.video_photo.paste(Image.frombuffer('RGB', DISPLAY_SIZE, blank, 'raw', 'RGB', 0, 1))
+        # The label shows the (blank) image from the start, so it already has
+        # the display size and frames never change the window layout
+        self.video_label = tk.Label(video_frame, bg='black', fg='white', image=self.video_photo,
+                                    text="Initializing camera...", compound=tk.CENTER)
         self.video_label.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
         # Status bar
@@ -94,17 +205,19 @@ class EmotionDetectorUI:
                                      bg='#2b2b2b', fg='white', font=('Arial', 11, 'bold'))
         emotion_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
         
-        self.emotion_label = tk.Label(emotion_frame, text="No face detected", 
-                                      font=('Arial', 16, 'bold'), bg='#2b2b2b', fg='#888888')
-        self.emotion_label.pack(pady=10)
-        
-        self.confidence_label = tk.Label(emotion_frame, text="Confidence: 0%", 
-                                         font=('Arial', 12), bg='#2b2b2b', fg='#aaaaaa')
-        self.confidence_label.pack(pady=(0, 10))
-        
-        # Confidence bar
-        self.confidence_bar = tk.Canvas(emotion_frame, height=20, bg='#2b2b2b', highlightthickness=0)
-        self.confidence_bar.pack(fill=tk.X, padx=10, pady=(0, 10))
+        # Emotion, confidence and confidence bar are items on one canvas,
+        # changed in place on each update (no widget relayout)
+        self.emotion_canvas = tk.Canvas(emotion_frame, height=96, bg='#2b2b2b', highlightthickness=0)
+        self.emotion_canvas.pack(fill=tk.X, padx=10, pady=(0, 10))
+        self._emotion_canvas_width = 0
+        self._confidence_fill_width = 0  # bar item starts empty
+        self.emotion_text_item = self.emotion_canvas.create_text(
+            0, 24, text="No face detected", font=('Arial', 16, 'bold'), fill='#888888')
+        self.confidence_text_item = self.emotion_canvas.create_text(
+            0, 58, text="Confidence: 0%", font=('Arial', 12), fill='#aaaaaa')
+        self.confidence_bar_item = self.emotion_canvas.create_rectangle(10, 75, 10, 85,
+                                                                        fill='#00ff88', outline='')
+        self.emotion_canvas.bind('<Configure>', self._layout_emotion_canvas)
         
         # Connection status
         conn_frame = tk.LabelFrame(status_frame, text="Connection Status", 
@@ -147,13 +260,17 @@ class EmotionDetectorUI:
                                    bg='#2b2b2b', fg='white', font=('Arial', 11, 'bold'))
         stats_frame.pack(fill=tk.X, pady=(10, 0))
         
-        self.stats_label = tk.Label(stats_frame, text="No data yet", 
-                                    font=('Arial', 9), bg='#2b2b2b', fg='#aaaaaa', justify=tk.LEFT)
-        self.stats_label.pack(padx=10, pady=10, anchor=tk.W)
+        # A canvas text item as well; the canvas only grows or shrinks when
+        # the number of lines changes
+        self.stats_canvas = tk.Canvas(stats_frame, height=0, bg='#2b2b2b', highlightthickness=0)
+        self.stats_canvas.pack(fill=tk.X, padx=10, pady=10)
+        self.stats_text_item = self.stats_canvas.create_text(
+            0, 0, anchor=tk.NW, text="", font=('Arial', 9), fill='#aaaaaa', justify=tk.LEFT)
+        self._stats_line_count = 0
+        self._set_stats_text(f"{self._display_stats_text}\nNo data yet")
     
     def _create_settings_widgets(self, parent):
         """Create settings control widgets with keyboard navigation."""
-        import config
         
         # Detection interval
         tk.Label(parent, text="Detection Interval (s):", bg='#2b2b2b', fg='white', 
@@ -166,9 +283,8 @@ class EmotionDetectorUI:
                                   command=self._on_interval_change)
         self.interval_scale.pack(fill=tk.X, padx=10, pady=(0, 10))
         # Make Up/Down navigate instead of adjusting slider value
-        # Add to focusable controls: (widget, name, type, get_value_func)
-        self.focusable_controls.append((self.interval_scale, "Detection Interval", "slider", 
-                                       lambda: f"{self.interval_var.get():.1f} seconds"))
+        self._register_control(self.interval_scale, "Detection Interval", "slider",
+                               lambda: f"{self.interval_var.get():.1f} seconds")
         
         # Strong confidence threshold
         tk.Label(parent, text="Strong Confidence Threshold:", bg='#2b2b2b', fg='white', 
@@ -181,8 +297,8 @@ class EmotionDetectorUI:
                               command=self._on_threshold_change)
         self.conf_scale.pack(fill=tk.X, padx=10, pady=(0, 10))
         # Make Up/Down navigate instead of adjusting slider value
-        self.focusable_controls.append((self.conf_scale, "Confidence Threshold", "slider",
-                                       lambda: f"{self.conf_thresh_var.get():.0%}"))
+        self._register_control(self.conf_scale, "Confidence Threshold", "slider",
+                               lambda: f"{self.conf_thresh_var.get():.0%}")
         
         # Cooldown period (COMMENTED OUT - uncomment if needed)
         # tk.Label(parent, text="Signal Cooldown (s):", bg='#2b2b2b', fg='white', 
@@ -195,77 +311,176 @@ class EmotionDetectorUI:
         #                           command=self._on_cooldown_change)
         # self.cooldown_scale.pack(fill=tk.X, padx=10, pady=(0, 10))
         # # Make Up/Down navigate instead of adjusting slider value
-        # self.focusable_controls.append((self.cooldown_scale, "Signal Cooldown", "slider",
-        #                                lambda: f"{self.cooldown_var.get():.0f} seconds"))
+        # self._register_control(self.cooldown_scale, "Signal Cooldown", "slider",
+        #                        lambda: f"{self.cooldown_var.get():.0f} seconds")
+    
+    def _register_control(self, widget, name, control_type, get_value=None):
+        """
+        Add a control to keyboard navigation. Slider range and step are read
+        from the widget once here, so key presses don't query Tk for them.
+        """
+        control = {'widget': widget, 'name': name, 'type': control_type, 'get_value': get_value}
+        if control_type == "slider":
+            control['from'] = float(widget['from'])
+            control['to'] = float(widget['to'])
+            control['resolution'] = float(widget['resolution'])
+        self.focusable_controls.append(control)
     
     def _on_interval_change(self, value):
         """Update detection interval."""
-        import config
         config.DETECTION_INTERVAL = float(value)
-        self.log(f"Detection interval set to {value}s")
+        self._log_setting('interval', f"Detection interval set to {value}s")
     
     def _on_threshold_change(self, value):
         """Update confidence threshold."""
-        import config
         config.STRONG_CONFIDENCE_THRESHOLD = float(value)
-        self.log(f"Confidence threshold set to {float(value):.0%}")
+        self._log_setting('threshold', f"Confidence threshold set to {float(value):.0%}")
     
     # Cooldown change handler (COMMENTED OUT - uncomment if Signal Cooldown slider is enabled)
     # def _on_cooldown_change(self, value):
     #     """Update cooldown period."""
-    #     import config
     #     config.SIGNAL_COOLDOWN_SECONDS = float(value)
-    #     self.log(f"Cooldown set to {value}s")
+    #     self._log_setting('cooldown', f"Cooldown set to {value}s")
     
+    def _log_setting(self, key, message):
+        """Log a setting change once the sliders have been still for SLIDER_LOG_DELAY_MS."""
+        # A drag fires the Scale command on every tick; the setting itself is
+        # applied right away, only the latest message per setting is logged
+        self._pending_setting_logs[key] = message
+        if self._setting_log_job is not None:
+            self.root.after_cancel(self._setting_log_job)
+        self._setting_log_job = self.root.after(SLIDER_LOG_DELAY_MS, self._log_setting_changes)
     
-    def update_video(self, frame):
-        """Update the video display with a new frame."""
+    def _log_setting_changes(self):
+        self._setting_log_job = None
+        for message in self._pending_setting_logs.values():
+            self.log(message)
+        self._pending_setting_logs.clear()
+    
+    
+    def _call_in_ui(self, func, *args):
+        """Run func(*args) on the Tk thread: directly if already on it, else queued."""
+        if threading.current_thread() is self._tk_thread:
+            func(*args)
+        elif self.running:
+            self._ui_queue.put_nowait((func, args))
+    
+    def _drain_ui_queue(self):
+        """Apply queued updates from other threads (Tk thread, every UI_QUEUE_POLL_MS)."""
         if not self.running:
             return
-        
         try:
-            # Resize frame for display
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame_pil = Image.fromarray(frame_rgb)
-            frame_pil = frame_pil.resize((640, 480), Image.Resampling.LANCZOS)
+            for _ in range(UI_QUEUE_MAX_BATCH):
+                try:
+                    func, args = self._ui_queue.get_nowait()
+                except queue.Empty:
+                    break
+                func(*args)
+        finally:
+            self.root.after(UI_QUEUE_POLL_MS, self._drain_ui_queue)
+    
+    def update_video(self, frame):
+        """Update the video display with a new frame (callable from any thread)."""
+        if not self.running or self._draw_scheduled:
+            # Tk hasn't drawn the previous frame yet: drop this one rather
+            # than converting frames faster than the display takes them
+            return
+        now = time.monotonic()
+        if now - self._last_display_ts < self._display_interval:
+            return
+        self._last_display_ts = now
+        
+        # Resize frame for display (OpenCV, before the color conversion;
+        # camera frames usually already have the display size). The RGB copy
+        # is ours, so the caller may reuse frame right away
+        if (frame.shape[1], frame.shape[0]) != DISPLAY_SIZE:
+            frame = cv2.resize(frame, DISPLAY_SIZE, dst=self._resize_buffer, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer)
+        self._draw_scheduled = True
+        self._call_in_ui(self._draw_frame)
+    
+    def _draw_frame(self):
+        """Draw the converted frame (Tk thread)."""
+        try:
+            if not self.running:
+                return
+            start = time.perf_counter()
+            frame_pil = Image.frombuffer('RGB', DISPLAY_SIZE, self._rgb_buffer, 'raw', 'RGB', 0, 1)
             
-            # Convert to PhotoImage
-            photo = ImageTk.PhotoImage(image=frame_pil)
+            # Repaint the existing PhotoImage instead of allocating a new one
+            self.video_photo.paste(frame_pil)
+            end = time.perf_counter()
+            self._record_draw_time(end - start)
+            self._frame_times.append(end)
             
-            # Update label
-            self.video_label.configure(image=photo, text="")
-            self.video_label.image = photo  # Keep a reference
-            self.camera_connected = True
-            self._update_connection_status()
+            if not self.camera_connected:
+                # First frame: remove the placeholder text over the video
+                self.video_label.configure(text="")
+                self.camera_connected = True
+                self._update_connection_status()
         except Exception as e:
             self.log(f"Error updating video: {e}")
+        finally:
+            self._draw_scheduled = False
+    
+    def _record_draw_time(self, seconds):
+        """Adapt the display interval to the recent average draw time (Tk thread)."""
+        self._draw_times.append(seconds)
+        average = sum(self._draw_times) / len(self._draw_times)
+        # Read by update_video on the detection thread; a float store is atomic
+        self._display_interval = max(1.0 / DISPLAY_MAX_FPS, average / DISPLAY_MAX_DRAW_SHARE)
     
     def update_emotion(self, emotion, confidence):
-        """Update the current emotion display."""
+        """Update the current emotion display (callable from any thread)."""
+        self._call_in_ui(self._show_emotion, emotion, confidence)
+    
+    def _show_emotion(self, emotion, confidence):
         self.current_emotion = emotion
         self.current_confidence = confidence
         
-        # Update labels
-        if emotion:
-            self.emotion_label.config(text=emotion.upper(), fg='#00ff88')
-            self.confidence_label.config(text=f"Confidence: {confidence:.0%}", fg='#aaaaaa')
-        else:
-            self.emotion_label.config(text="No face detected", fg='#888888')
-            self.confidence_label.config(text="Confidence: 0%", fg='#aaaaaa')
-        
-        # Update confidence bar
-        self.confidence_bar.delete("all")
-        bar_width = self.confidence_bar.winfo_width() - 20
-        if bar_width > 0:
-            fill_width = int(bar_width * confidence)
-            self.confidence_bar.create_rectangle(10, 5, 10 + fill_width, 15, 
-                                                fill='#00ff88', outline='')
+        # Only touch the canvas when the shown emotion or percentage changes
+        # (a steady emotion is the common case)
+        shown_state = (emotion, round(confidence, 2))
+        if shown_state != self._shown_emotion_state:
+            self._shown_emotion_state = shown_state
+            canvas = self.emotion_canvas
+            if emotion:
+                canvas.itemconfigure(self.emotion_text_item, text=emotion.upper(), fill='#00ff88')
+                canvas.itemconfigure(self.confidence_text_item, text=f"Confidence: {confidence:.0%}")
+            else:
+                canvas.itemconfigure(self.emotion_text_item, text="No face detected", fill='#888888')
+                canvas.itemconfigure(self.confidence_text_item, text="Confidence: 0%")
+            self._draw_confidence_bar()
         
         # Add to history
         if emotion:
-            self.emotion_history.append(emotion)
+            history = self.emotion_history
+            if len(history) == history.maxlen:
+                # Oldest entry is about to drop out of the deque
+                oldest = history[0]
+                self._emotion_counts[oldest] -= 1
+                if not self._emotion_counts[oldest]:
+                    del self._emotion_counts[oldest]
+            history.append(emotion)
+            self._emotion_counts[emotion] += 1
             self._update_statistics()
     
+    def _layout_emotion_canvas(self, event):
+        """Center the texts and rescale the bar when the canvas is resized."""
+        self._emotion_canvas_width = event.width
+        center = event.width / 2
+        self.emotion_canvas.coords(self.emotion_text_item, center, 24)
+        self.emotion_canvas.coords(self.confidence_text_item, center, 58)
+        self._draw_confidence_bar()
+    
+    def _draw_confidence_bar(self):
+        bar_width = max(self._emotion_canvas_width - 20, 0)
+        fill_width = int(bar_width * self.current_confidence)
+        if fill_width == self._confidence_fill_width:
+            return  # same pixel width: no need to invalidate the canvas
+        self._confidence_fill_width = fill_width
+        self.emotion_canvas.coords(self.confidence_bar_item, 10, 75, 10 + fill_width, 85)
+    
     def update_signal(self, signal_text):
         """Update the last signal text."""
         self.last_signal_text = signal_text
@@ -273,7 +488,7 @@ class EmotionDetectorUI:
     def set_serial_connected(self, connected):
         """Update serial connection status."""
         self.serial_connected = connected
-        self._update_connection_status()
+        self._call_in_ui(self._update_connection_status)
     
     def _update_connection_status(self):
         """Update connection status labels."""
@@ -288,35 +503,96 @@ class EmotionDetectorUI:
             self.serial_status.config(text="🔌 Hardware: Not connected", fg='#ff6666')
     
     def _update_statistics(self):
-        """Update statistics display."""
+        """Update statistics display, at most once per STATS_REFRESH_SECONDS."""
+        if self._stats_refresh_pending:
+            return
+        wait = STATS_REFRESH_SECONDS - (time.monotonic() - self._stats_last_render)
+        if wait > 0:
+            # Fold all updates until then into one refresh
+            self._stats_refresh_pending = True
+            self.root.after(int(wait * 1000), self._render_statistics)
+            return
+        self._render_statistics()
+    
+    def _refresh_display_stats(self):
+        """Recompute display rate and frame-interval p95 (Tk thread, every STATS_REFRESH_SECONDS)."""
+        if not self.running:
+            return
+        times = list(self._frame_times)
+        # No frame since the last refresh: the camera stopped, old rates are stale
+        if len(times) >= 3 and time.perf_counter() - times[-1] < STATS_REFRESH_SECONDS:
+            intervals = [b - a for a, b in zip(times, times[1:])]
+            fps = len(intervals) / (times[-1] - times[0])
+            p95 = statistics.quantiles(intervals, n=20)[18]
+            text = f"Display: {fps:.1f} fps, p95 {p95 * 1000:.0f} ms"
+        else:
+            text = "Display: no frames"
+        # Repaint the panel only when the line changed (not while idle)
+        if text != self._display_stats_text:
+            self._display_stats_text = text
+            self._update_statistics()
+        self.root.after(int(STATS_REFRESH_SECONDS * 1000), self._refresh_display_stats)
+    
+    def _render_statistics(self):
+        self._stats_refresh_pending = False
+        self._stats_last_render = time.monotonic()
         if not self.emotion_history:
-            self.stats_label.config(text="No data yet")
+            self._set_stats_text(f"{self._display_stats_text}\nNo data yet")
             return
         
-        from collections import Counter
-        counts = Counter(self.emotion_history)
         total = len(self.emotion_history)
         
-        stats_lines = [f"Total detections: {total}"]
-        for emotion, count in counts.most_common():
+        stats_lines = [self._display_stats_text, f"Total detections: {total}"]
+        for emotion, count in self._emotion_counts.most_common():
             percentage = (count / total) * 100
             stats_lines.append(f"{emotion:>10}: {count:>3} ({percentage:>5.1f}%)")
         
-        self.stats_label.config(text="\n".join(stats_lines))
+        self._set_stats_text("\n".join(stats_lines))
+    
+    def _set_stats_text(self, text):
+        self.stats_canvas.itemconfigure(self.stats_text_item, text=text)
+        line_count = text.count("\n") + 1
+        if line_count != self._stats_line_count:
+            self._stats_line_count = line_count
+            self.stats_canvas.configure(height=self.stats_canvas.bbox(self.stats_text_item)[3])
     
     def log(self, message):
-        """Add a message to the activity log."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}\n"
-        
+        """Add a message to the activity log (callable from any thread)."""
+        timestamp = time.strftime("%H:%M:%S")
+        # deque.append is thread-safe; a flush is only armed while entries wait
+        self._log_buffer.append(f"[{timestamp}] {message}\n")
+        if not self._log_flush_pending:
+            self._log_flush_pending = True
+            self._call_in_ui(self._schedule_log_flush)
+    
+    def _schedule_log_flush(self):
+        self.root.after(LOG_FLUSH_MS, self._flush_log)
+    
+    def _flush_log(self):
+        """Write buffered log entries with one insert (Tk thread)."""
+        # Cleared before draining: an entry added meanwhile is either drained
+        # here or arms the next flush
+        self._log_flush_pending = False
+        if not self.running:
+            return
+        entries = []
+        while self._log_buffer:
+            entries.append(self._log_buffer.popleft())
+        if entries:
+            self._append_log("".join(entries))
+    
+    def _append_log(self, log_entry):
         self.log_text.config(state=tk.NORMAL)
         self.log_text.insert(tk.END, log_entry)
         self.log_text.see(tk.END)
         
-        # Limit log size
-        lines = self.log_text.get("1.0", tk.END).split('\n')
-        if len(lines) > 200:
-            self.log_text.delete("1.0", f"{len(lines)-200}.0")
+        # Limit log size by dropping the oldest lines (counted, not re-read);
+        # trimming in batches keeps the text widget from shifting every line
+        self._log_lines += log_entry.count('\n')
+        excess = self._log_lines - MAX_LOG_LINES
+        if excess >= LOG_TRIM_BATCH:
+            self.log_text.delete("1.0", f"{excess + 1}.0")
+            self._log_lines -= excess
         
         self.log_text.config(state=tk.DISABLED)
     
@@ -346,9 +622,9 @@ class EmotionDetectorUI:
         self.root.bind('<Tab>', lambda e: self._navigate_focus(1))
         self.root.bind('<Shift-Tab>', lambda e: self._navigate_focus(-1))
         
-        # Set initial focus
+        # Set initial focus once the window is up
         if self.focusable_controls:
-            self._update_focus_display()
+            self.root.after_idle(self._update_focus_display)
     
     def _navigate_focus(self, direction):
         """Navigate focus between controls."""
@@ -370,29 +646,24 @@ class EmotionDetectorUI:
     def _clear_focus_display(self):
         """Clear visual focus from current control."""
         if 0 <= self.focused_control_index < len(self.focusable_controls):
-            widget, _, _, _ = self.focusable_controls[self.focused_control_index]
-            if isinstance(widget, tk.Scale):
-                widget.config(highlightbackground='#555555', highlightthickness=2)
-            elif isinstance(widget, tk.Button):
-                widget.config(highlightbackground='#555555', highlightthickness=2)
+            widget = self.focusable_controls[self.focused_control_index]['widget']
+            widget.config(highlightbackground='#555555', highlightthickness=2)
     
     def _update_focus_display(self):
         """Update visual focus and announce current control."""
         if not self.focusable_controls or self.focused_control_index < 0:
             return
         
-        widget, name, control_type, get_value = self.focusable_controls[self.focused_control_index]
+        control = self.focusable_controls[self.focused_control_index]
+        name, get_value = control['name'], control['get_value']
         
         # Highlight focused control
-        if isinstance(widget, tk.Scale):
-            widget.config(highlightbackground='green', highlightthickness=3)  # Green highlight
-            widget.focus_set()
-        elif isinstance(widget, tk.Button):
-            widget.config(highlightbackground='green', highlightthickness=3)
-            widget.focus_set()
+        widget = control['widget']
+        widget.config(highlightbackground='green', highlightthickness=3)  # Green highlight
+        widget.focus_set()
         
         # Announce via audio
-        if control_type == "slider":
+        if control['type'] == "slider":
             value_text = get_value() if get_value else ""
             announcement = f"{name} slider, value: {value_text}. Use left and right arrows to adjust."
         else:  # button
@@ -405,82 +676,98 @@ class EmotionDetectorUI:
         if not self.focusable_controls or self.focused_control_index < 0:
             return "break"
         
-        widget, name, control_type, get_value = self.focusable_controls[self.focused_control_index]
+        control = self.focusable_controls[self.focused_control_index]
         
-        # Only adjust if a slider is focused
-        if control_type == "slider" and isinstance(widget, tk.Scale):
-            self._adjust_slider_value(widget, name, get_value, direction)
+        # Only adjust if a slider is focused; key-repeat steps are collected
+        # and applied together
+        if control['type'] == "slider":
+            if self._slider_control is not control:
+                self._flush_slider_steps()
+                self._slider_control = control
+            self._slider_steps += direction
+            if self._slider_flush_job is None:
+                self._slider_flush_job = self.root.after(SLIDER_STEP_COALESCE_MS, self._flush_slider_steps)
         
         # Prevent default slider behavior
         return "break"
     
-    def _adjust_slider_value(self, widget, name, get_value, direction):
-        """Adjust slider value."""
-        current = widget.get()
-        resolution = widget['resolution']
-        new_value = current + (direction * resolution)
+    def _flush_slider_steps(self):
+        """Apply the arrow-key steps collected for the slider in one change."""
+        if self._slider_flush_job is not None:
+            self.root.after_cancel(self._slider_flush_job)
+            self._slider_flush_job = None
+        control, steps = self._slider_control, self._slider_steps
+        self._slider_control, self._slider_steps = None, 0
+        if control is not None and steps:
+            self._adjust_slider_value(control, steps)
+    
+    def _adjust_slider_value(self, control, steps):
+        """Move a slider by a number of resolution steps."""
+        widget = control['widget']
+        new_value = widget.get() + (steps * control['resolution'])
         
         # Clamp to min/max
-        min_val = widget['from']
-        max_val = widget['to']
-        new_value = max(min_val, min(max_val, new_value))
+        new_value = max(control['from'], min(control['to'], new_value))
         
+        # The Scale's own command= callback fires for the change
         widget.set(new_value)
-        # Trigger the callback manually (they expect string from command callback)
-        if widget == self.interval_scale:
-            self._on_interval_change(str(new_value))
-        elif widget == self.conf_scale:
-            self._on_threshold_change(str(new_value))
-        # elif widget == self.cooldown_scale:
-        #     self._on_cooldown_change(str(new_value))
-        
-        # Announce new value (throttled)
-        value_text = get_value() if get_value else f"{new_value:.2f}"
+        
+        # Log the new value once the slider has stopped moving
+        if self._slider_log_job is not None:
+            self.root.after_cancel(self._slider_log_job)
+        self._slider_log_job = self.root.after(SLIDER_LOG_DELAY_MS, self._log_slider_value, control)
+    
+    def _log_slider_value(self, control):
+        self._slider_log_job = None
+        get_value = control['get_value']
+        value_text = get_value() if get_value else f"{control['widget'].get():.2f}"
         # Don't announce every tiny change - only log it
-        self.log(f"{name} adjusted to {value_text}")
+        self.log(f"{control['name']} adjusted to {value_text}")
     
     def _activate_focused(self):
         """Activate the focused control (button press)."""
         if not self.focusable_controls or self.focused_control_index < 0:
             return
         
-        widget, name, control_type, _ = self.focusable_controls[self.focused_control_index]
+        control = self.focusable_controls[self.focused_control_index]
         
-        if control_type == "button" and isinstance(widget, tk.Button):
-            widget.invoke()  # Simulate button click
-            self._announce(f"{name} activated")
+        if control['type'] == "button":
+            control['widget'].invoke()  # Simulate button click
+            self._announce(f"{control['name']} activated")
     
     def _announce(self, message):
         """Announce message via text-to-speech (non-blocking)."""
         self.log(f"[Navigation] {message}")
         
-        if self.audio_enabled:
+        if self.audio_enabled and SPEECH_COMMAND:
+            # Replace an announcement that hasn't been spoken yet
             try:
-                # Use threading to prevent blocking
-                def speak():
-                    try:
-                        if platform.system() == 'Darwin':  # macOS
-                            subprocess.Popen(['say', message], 
-                                           stdout=subprocess.DEVNULL, 
-                                           stderr=subprocess.DEVNULL,
-                                           start_new_session=True)
-                        elif platform.system() == 'Linux':
-                            subprocess.Popen(['espeak', message], 
-                                           stdout=subprocess.DEVNULL, 
-                                           stderr=subprocess.DEVNULL,
-                                           start_new_session=True)
-                    except:
-                        pass
-                
-                threading.Thread(target=speak, daemon=True).start()
-            except:
+                self._speech_queue.get_nowait()
+            except queue.Empty:
                 pass
+            self._speech_queue.put_nowait(message)  # only the Tk thread announces
     
-    def _update_loop(self):
-        """Non-blocking update loop for UI."""
-        if self.running:
-            self.root.update()
-            self.root.after(10, self._update_loop)  # Update every 10ms
+    def _speech_worker(self):
+        """Speak queued announcements; a new one cuts off the one still speaking."""
+        speak = _open_native_speech()
+        process = None
+        while True:
+            message = self._speech_queue.get()
+            if speak is not None:
+                try:
+                    speak(message)
+                    continue
+                except Exception:
+                    speak = None  # Fall back to the command-line tool
+            if process is not None and process.poll() is None:
+                process.terminate()
+            try:
+                process = subprocess.Popen([SPEECH_COMMAND, message],
+                                           stdout=subprocess.DEVNULL,
+                                           stderr=subprocess.DEVNULL,
+                                           start_new_session=True)
+            except OSError:
+                process = None
     
     def on_closing(self):
         """Handle window closing."""